@@ -16,11 +16,20 @@ Authors: Richard Quinn & Claude Opus 4 (Anthropic)
 Date: 21-22 February 2026
 """
 
+import functools
+import heapq
+import multiprocessing
 import random
 import math
-import json
-from collections import Counter, defaultdict
-from typing import Dict, List, Tuple, Optional
+from collections import Counter
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional: CloFE falls back to its NumPy update path
+    njit = None
 
 
 # ============================================================================
@@ -31,12 +40,19 @@ class CountMinSketch:
     """
     Standard Count-Min Sketch (Cormode & Muthukrishnan, 2005).
     The high-activation default solution. Hashing + counters.
+
+    With conservative=True, an update only increments the rows whose
+    counter equals the current minimum for that item (Estan & Varghese,
+    2002), which tightens overestimates without changing the query rule.
     """
 
-    def __init__(self, width: int = 100, depth: int = 5, seed: int = 42):
+    def __init__(self, width: int = 100, depth: int = 5, seed: int = 42,
+                 conservative: bool = False):
         self.width = width
         self.depth = depth
-        self.table = [[0] * width for _ in range(depth)]
+        self.conservative = conservative
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self._rows = np.arange(depth)
         # Generate hash parameters (universal hashing: (a*x + b) mod p mod w)
         rng = random.Random(seed)
         self.p = 2**31 - 1  # Mersenne prime
@@ -44,21 +60,50 @@ class CountMinSketch:
             (rng.randint(1, self.p - 1), rng.randint(0, self.p - 1))
             for _ in range(depth)
         ]
+        # Column vectors of the same parameters for batch hashing
+        self._a = np.array([a for a, _ in self.hash_params], dtype=np.int64)[:, None]
+        self._b = np.array([b for _, b in self.hash_params], dtype=np.int64)[:, None]
 
     def _hash(self, item: int, row: int) -> int:
         a, b = self.hash_params[row]
         return ((a * hash(item) + b) % self.p) % self.width
 
     def update(self, item):
+        cols = [self._hash(item, row) for row in range(self.depth)]
+        if not self.conservative:
+            self.table[self._rows, cols] += 1
+            return
+        counters = self.table[self._rows, cols]
+        hit = counters == counters.min()
+        self.table[self._rows[hit], np.asarray(cols)[hit]] += 1
+
+    def update_many(self, items: np.ndarray):
+        """
+        Ingest a batch of items in one vectorized pass.
+
+        The vectorized hashing matches update() only for non-negative
+        integers below 2**32 (where hash(x) == x and a*x fits in int64), so
+        any other batch goes item by item through update(). Conservative
+        updates depend on arrival order, so they always go item by item.
+        """
+        arr = np.asarray(items)
+        if (self.conservative or arr.ndim != 1 or arr.size == 0
+                or not np.issubdtype(arr.dtype, np.integer)
+                or arr.min() < 0 or arr.max() >= 2**32):
+            for item in items:
+                self.update(item)
+            return
+        items = arr.astype(np.int64)
+        cols = ((self._a * items[None, :] + self._b) % self.p) % self.width
         for row in range(self.depth):
-            col = self._hash(item, row)
-            self.table[row][col] += 1
+            counts = np.bincount(cols[row], minlength=self.width)
+            self.table[row] += counts.astype(np.uint32)
 
     def query(self, item) -> int:
-        return min(
-            self.table[row][self._hash(item, row)]
+        return int(min(
+            self.table[row, self._hash(item, row)]
             for row in range(self.depth)
-        )
+        ))
 
     def memory_usage(self) -> int:
         """Approximate memory in 'units' (number of stored values)."""
@@ -134,18 +179,146 @@ class ResonanceFrequencyEstimator:
 # ALGORITHM 3: Clonal Frequency Estimator (CloFE) — Novel, High-κ
 # ============================================================================
 
-class ImmuneCell:
-    """A single immune cell in the CloFE population."""
-    __slots__ = ['element', 'affinity', 'age', 'generation']
+def _clofe_compact(elements, affinity, age, generation, size, keep):
+    """Move cells where `keep` is set to the front, in order; return the new size."""
+    write = 0
+    for i in range(size):
+        if keep[i]:
+            elements[write] = elements[i]
+            affinity[write] = affinity[i]
+            age[write] = age[i]
+            generation[write] = generation[i]
+            write += 1
+    return write
+
+
+def _clofe_update_kernel(elements, affinity, age, generation, size, item, rng,
+                         carrying_capacity, max_clone_fraction, regulatory_strength,
+                         mutation_sigma, apoptosis_age, base_survival,
+                         affinity_survival_bonus, max_expansion, naive_batch):
+    """
+    One CloFE antigen encounter as a single compiled pass over the population
+    columns; returns the new live size. Mirrors
+    ClonalFrequencyEstimator._update_numpy step for step, including the order
+    random draws are taken from `rng`, so both paths agree for a given seed.
+    """
+    # --- 1. Recognition ---
+    match_idx = np.empty(size, dtype=np.int64)
+    num_match = 0
+    for i in range(size):
+        if elements[i] == item:
+            match_idx[num_match] = i
+            num_match += 1
+    match_idx = match_idx[:num_match]
+
+    # --- 2. Regulatory T-cell check ---
+    clone_freq = num_match / size if size else 0.0
+    suppression = 0.0
+    if clone_freq > max_clone_fraction:
+        suppression = regulatory_strength * (clone_freq - max_clone_fraction) / (1 - max_clone_fraction + 0.01)
+        suppression = min(suppression, 0.95)
+
+    # --- 3. Clonal expansion with affinity maturation ---
+    expansion_rate = max(0, max_expansion - int(suppression * 3))
+    for i in match_idx:
+        age[i] = max(0, age[i] - 1)
+        affinity[i] = min(affinity[i] + 0.05, 3.0)
+    stimulated = np.empty(num_match, dtype=np.bool_)
+    num_stimulated = 0
+    for j in range(num_match):
+        stimulated[j] = rng.random() > suppression
+        if stimulated[j]:
+            num_stimulated += 1
+    clone_affinity = np.empty(num_stimulated * expansion_rate, dtype=np.float64)
+    clone_generation = np.empty(num_stimulated * expansion_rate, dtype=np.int64)
+    num_clones = 0
+    for j in range(num_match):
+        if stimulated[j]:
+            i = match_idx[j]
+            for _ in range(expansion_rate):
+                clone_affinity[num_clones] = max(0.1, affinity[i] + rng.normal(0.0, mutation_sigma))
+                clone_generation[num_clones] = generation[i] + 1
+                num_clones += 1
+
+    # --- 4. Clonal deletion (immune tolerance) ---
+    if clone_freq > max_clone_fraction * 1.5:
+        target_size = int(max_clone_fraction * size)
+        if num_match > target_size:
+            order = np.argsort(-affinity[match_idx], kind='mergesort')
+            keep = np.ones(size, dtype=np.bool_)
+            for j in order[target_size:]:
+                keep[match_idx[j]] = False
+            size = _clofe_compact(elements, affinity, age, generation, size, keep)
+
+    # --- 5/6. Aging + apoptosis, fused into one compacting pass ---
+    pressure_factor = max(0.4, 1.0 - 0.4 * (size / carrying_capacity))
+    write = 0
+    for i in range(size):
+        age[i] += 1
+        if age[i] >= apoptosis_age:
+            survival_prob = min(base_survival + affinity_survival_bonus * affinity[i], 0.98)
+            if not rng.random() < survival_prob * pressure_factor:
+                continue
+        elements[write] = elements[i]
+        affinity[write] = affinity[i]
+        age[write] = age[i]
+        generation[write] = generation[i]
+        write += 1
+    size = write
+
+    # Add clones to population
+    for c in range(num_clones):
+        elements[size] = item
+        affinity[size] = clone_affinity[c]
+        age[size] = 0
+        generation[size] = clone_generation[c]
+        size += 1
+
+    # --- 7. Homeostasis (carrying capacity enforcement) ---
+    if size > carrying_capacity:
+        fitness = affinity[:size] / (1 + age[:size] * 0.1)
+        fittest = np.argsort(-fitness, kind='mergesort')[:carrying_capacity]
+        elements[:carrying_capacity] = elements[fittest]
+        affinity[:carrying_capacity] = affinity[fittest]
+        age[:carrying_capacity] = age[fittest]
+        generation[:carrying_capacity] = generation[fittest]
+        size = carrying_capacity
+
+    # --- 8. Naive recruitment ---
+    current_matching = 0
+    for i in range(size):
+        if elements[i] == item:
+            current_matching += 1
+    if current_matching < 3:
+        num_naive = min(naive_batch, max(0, carrying_capacity - size))
+        for _ in range(num_naive):
+            elements[size] = item
+            affinity[size] = 1.0
+            age[size] = 0
+            generation[size] = 0
+            size += 1
+    return size
+
+
+def _clofe_update_many_kernel(elements, affinity, age, generation, size, items, rng,
+                              carrying_capacity, max_clone_fraction, regulatory_strength,
+                              mutation_sigma, apoptosis_age, base_survival,
+                              affinity_survival_bonus, max_expansion, naive_batch):
+    """_clofe_update_kernel over a batch of interned items, in stream order."""
+    for item in items:
+        size = _clofe_update_kernel(
+            elements, affinity, age, generation, size, item, rng,
+            carrying_capacity, max_clone_fraction, regulatory_strength,
+            mutation_sigma, apoptosis_age, base_survival,
+            affinity_survival_bonus, max_expansion, naive_batch,
+        )
+    return size
 
-    def __init__(self, element, affinity: float = 1.0, age: int = 0, generation: int = 0):
-        self.element = element
-        self.affinity = affinity
-        self.age = age
-        self.generation = generation
 
-    def __repr__(self):
-        return f"Cell({self.element}, aff={self.affinity:.2f}, age={self.age}, gen={self.generation})"
+if njit is not None:
+    _clofe_compact = njit(cache=True)(_clofe_compact)
+    _clofe_update_kernel = njit(cache=True)(_clofe_update_kernel)
+    _clofe_update_many_kernel = njit(cache=True)(_clofe_update_many_kernel)
 
 
 class ClonalFrequencyEstimator:
@@ -169,6 +342,12 @@ class ClonalFrequencyEstimator:
     κ ≈ 0.85. Removing the immunological framework leaves nothing recognizable
     as a streaming algorithm.
 
+    The population is stored column-wise (element id, affinity, age,
+    generation) in buffers preallocated for the largest population a single
+    update can produce; only the first `size` slots are live. When Numba is
+    installed each update runs as one compiled kernel over those columns;
+    otherwise the same steps run as NumPy array operations.
+
     Parameters:
         carrying_capacity: Maximum population size (memory budget)
         expansion_rate: Number of clones per stimulated cell
@@ -178,6 +357,12 @@ class ClonalFrequencyEstimator:
         affinity_survival_bonus: Survival bonus proportional to affinity
     """
 
+    # Clones per stimulated cell before Treg suppression. Every matching cell
+    # can clone before homeostasis runs, so mid-update the population can
+    # reach carrying_capacity * (1 + _MAX_EXPANSION).
+    _MAX_EXPANSION = 2
+    _NAIVE_BATCH = 8
+
     def __init__(
         self,
         carrying_capacity: int = 2000,
@@ -196,19 +381,48 @@ class ClonalFrequencyEstimator:
         self.apoptosis_age = apoptosis_age
         self.base_survival = base_survival
         self.affinity_survival_bonus = affinity_survival_bonus
-        self.rng = random.Random(seed)
+        # NumPy Generator: usable inside the Numba kernel and from the NumPy
+        # path, with identical draws either way
+        self.rng = np.random.default_rng(seed)
 
         # The immune population
-        self.population: List[ImmuneCell] = []
+        cap = carrying_capacity * (1 + self._MAX_EXPANSION)
+        self.elements = np.empty(cap, dtype=np.int32)
+        self.affinity = np.empty(cap, dtype=np.float64)
+        self.age = np.empty(cap, dtype=np.int64)
+        self.generation = np.empty(cap, dtype=np.int64)
+        self.size = 0
         # Total elements seen (for normalization)
         self.total_seen = 0
-
-    def _clonal_frequency(self, element) -> float:
-        """Fraction of population specific to this element."""
-        if not self.population:
-            return 0.0
-        matching = sum(1 for c in self.population if c.element == element)
-        return matching / len(self.population)
+        # Antigen interning: cells carry a dense int id, not the raw element,
+        # so recognition is a plain integer compare
+        self._elem_id: Dict[object, int] = {}
+        self._elem_rev: List[object] = []
+
+    def _intern(self, element) -> int:
+        """Map an element to its dense int id, assigning a new id if unseen."""
+        i = self._elem_id.get(element)
+        if i is None:
+            i = len(self._elem_id)
+            self._elem_id[element] = i
+            self._elem_rev.append(element)
+        return i
+
+    def _append(self, element: int, affinity, generation, count: int) -> None:
+        """Add `count` age-0 cells for `element` at the end of the population."""
+        start, end = self.size, self.size + count
+        self.elements[start:end] = element
+        self.affinity[start:end] = affinity
+        self.age[start:end] = 0
+        self.generation[start:end] = generation
+        self.size = end
+
+    def _compact(self, keep: np.ndarray) -> None:
+        """Drop cells where `keep` is False, preserving survivor order."""
+        n = int(np.count_nonzero(keep))
+        for column in (self.elements, self.affinity, self.age, self.generation):
+            np.compress(keep, column[:self.size], out=column[:n])
+        self.size = n
 
     def update(self, item):
         """
@@ -219,20 +433,56 @@ class ClonalFrequencyEstimator:
         3. Clonal expansion: Matching cells proliferate with affinity maturation.
         4. Clonal deletion: Trim over-represented clones (immune tolerance).
         5. Aging: All cells age by one timestep.
-        6. Apoptosis: Old, low-affinity cells may die.
+        6. Apoptosis: Old, low-affinity cells may die (fused with aging).
         7. Homeostasis: If population exceeds carrying capacity, cull weakest.
         8. Naive recruitment: If no matching cells exist, recruit naive cells.
         """
         self.total_seen += 1
+        item = self._intern(item)
+        if njit is None:
+            self._update_numpy(item)
+            return
+        self.size = _clofe_update_kernel(
+            self.elements, self.affinity, self.age, self.generation, self.size,
+            item, self.rng, self.carrying_capacity, self.max_clone_fraction,
+            self.regulatory_strength, self.mutation_sigma, self.apoptosis_age,
+            self.base_survival, self.affinity_survival_bonus,
+            self._MAX_EXPANSION, self._NAIVE_BATCH,
+        )
+
+    def update_many(self, items) -> None:
+        """
+        Process a batch of stream elements, equivalent to update() on each.
 
+        Items are interned up front and, when numba is available, the whole
+        batch runs inside one compiled loop.
+        """
+        if isinstance(items, np.ndarray):
+            items = items.tolist()
+        ids = np.array([self._intern(item) for item in items], dtype=np.int32)
+        self.total_seen += ids.size
+        if njit is None:
+            for item in ids.tolist():
+                self._update_numpy(item)
+            return
+        self.size = _clofe_update_many_kernel(
+            self.elements, self.affinity, self.age, self.generation, self.size,
+            ids, self.rng, self.carrying_capacity, self.max_clone_fraction,
+            self.regulatory_strength, self.mutation_sigma, self.apoptosis_age,
+            self.base_survival, self.affinity_survival_bonus,
+            self._MAX_EXPANSION, self._NAIVE_BATCH,
+        )
+
+    def _update_numpy(self, item: int) -> None:
+        """update() steps 1-8 for an interned item, as NumPy array operations."""
         # --- 1. Recognition ---
-        matching = [c for c in self.population if c.element == item]
+        match_idx = np.flatnonzero(self.elements[:self.size] == item)
 
         # --- 2. Regulatory T-cell check ---
         # In immunology, Tregs suppress excessive immune responses to prevent
         # autoimmunity. Here, they prevent clonal dominance that would destroy
         # frequency resolution for other elements.
-        clone_freq = self._clonal_frequency(item)
+        clone_freq = match_idx.size / self.size if self.size else 0.0
         suppression = 0.0
         if clone_freq > self.max_clone_fraction:
             # Regulatory suppression increases with dominance
@@ -240,82 +490,71 @@ class ClonalFrequencyEstimator:
             suppression = min(suppression, 0.95)
 
         # --- 3. Clonal expansion with affinity maturation ---
-        new_clones = []
-        expansion_rate = max(0, 2 - int(suppression * 3))  # Tregs reduce expansion
-
-        for cell in matching:
-            # Stimulated cells get younger (re-stimulation resets age partially)
-            cell.age = max(0, cell.age - 1)
-            # Affinity increases with stimulation (somatic hypermutation)
-            cell.affinity = min(cell.affinity + 0.05, 3.0)
-
-            # Clonal expansion (suppressed by Tregs for dominant clones)
-            if self.rng.random() > suppression:
-                for _ in range(expansion_rate):
-                    clone_affinity = max(
-                        0.1,
-                        cell.affinity + self.rng.gauss(0, self.mutation_sigma)
-                    )
-                    new_clones.append(ImmuneCell(
-                        element=item,
-                        affinity=clone_affinity,
-                        age=0,
-                        generation=cell.generation + 1
-                    ))
+        expansion_rate = max(0, self._MAX_EXPANSION - int(suppression * 3))  # Tregs reduce expansion
+
+        # Stimulated cells get younger (re-stimulation resets age partially)
+        self.age[match_idx] = np.maximum(self.age[match_idx] - 1, 0)
+        # Affinity increases with stimulation (somatic hypermutation)
+        self.affinity[match_idx] = np.minimum(self.affinity[match_idx] + 0.05, 3.0)
+
+        # Clonal expansion (suppressed by Tregs for dominant clones). Each
+        # parent's clones are consecutive, matching the kernel's draw order.
+        parents = match_idx[self.rng.random(match_idx.size) > suppression]
+        mutations = self.rng.normal(0.0, self.mutation_sigma, (parents.size, expansion_rate))
+        clone_affinity = np.maximum(0.1, self.affinity[parents][:, None] + mutations).ravel()
+        clone_generation = np.repeat(self.generation[parents] + 1, expansion_rate)
 
         # --- 4. Clonal deletion (immune tolerance) ---
         # Over-represented clones are actively trimmed. This is analogous to
         # central tolerance / clonal deletion in the thymus.
+        # Nothing has been added or removed since recognition, so match_idx
+        # still indexes exactly this clone.
         if clone_freq > self.max_clone_fraction * 1.5:
             # Delete excess cells from this clone, keeping highest-affinity
-            all_matching = [c for c in self.population if c.element == item]
-            target_size = int(self.max_clone_fraction * len(self.population))
-            if len(all_matching) > target_size:
-                all_matching.sort(key=lambda c: c.affinity, reverse=True)
-                to_keep = set(id(c) for c in all_matching[:target_size])
-                self.population = [c for c in self.population
-                                   if c.element != item or id(c) in to_keep]
-
-        # --- 5. Aging ---
-        for cell in self.population:
-            cell.age += 1
-
-        # --- 6. Apoptosis (programmed cell death) ---
-        survivors = []
-        for cell in self.population:
-            if cell.age < self.apoptosis_age:
-                survivors.append(cell)
-            else:
-                survival_prob = self.base_survival + self.affinity_survival_bonus * cell.affinity
-                survival_prob = min(survival_prob, 0.98)
-                pressure = len(self.population) / self.carrying_capacity
-                survival_prob *= max(0.4, 1.0 - 0.4 * pressure)
-                if self.rng.random() < survival_prob:
-                    survivors.append(cell)
+            target_size = int(self.max_clone_fraction * self.size)
+            if match_idx.size > target_size:
+                order = np.argsort(-self.affinity[match_idx], kind='stable')
+                keep = np.ones(self.size, dtype=bool)
+                keep[match_idx[order[target_size:]]] = False
+                self._compact(keep)
+
+        # --- 5/6. Aging + apoptosis (programmed cell death) ---
+        # Fused into one pass: ages are bumped in place and the same pass
+        # yields the apoptosis-eligible mask. Survivor compaction only runs
+        # when at least one cell actually dies.
+        age = self.age[:self.size]
+        old = np.add(age, 1, out=age) >= self.apoptosis_age
+        num_old = int(np.count_nonzero(old))
+        if num_old:
+            survival_prob = self.base_survival + self.affinity_survival_bonus * self.affinity[:self.size][old]
+            survival_prob = np.minimum(survival_prob, 0.98)
+            pressure = self.size / self.carrying_capacity
+            survival_prob *= max(0.4, 1.0 - 0.4 * pressure)
+            survived = self.rng.random(num_old) < survival_prob
+            if not survived.all():
+                keep = ~old
+                keep[old] = survived
+                self._compact(keep)
 
         # Add clones to population
-        self.population = survivors + new_clones
+        if clone_affinity.size:
+            self._append(item, clone_affinity, clone_generation, clone_affinity.size)
 
         # --- 7. Homeostasis (carrying capacity enforcement) ---
-        if len(self.population) > self.carrying_capacity:
-            self.population.sort(
-                key=lambda c: (c.affinity / (1 + c.age * 0.1)),
-                reverse=True
-            )
-            self.population = self.population[:self.carrying_capacity]
+        if self.size > self.carrying_capacity:
+            fitness = self.affinity[:self.size] / (1 + self.age[:self.size] * 0.1)
+            fittest = np.argsort(-fitness, kind='stable')[:self.carrying_capacity]
+            for column in (self.elements, self.affinity, self.age, self.generation):
+                column[:self.carrying_capacity] = column[fittest]
+            self.size = self.carrying_capacity
 
         # --- 8. Naive recruitment (if antigen is new or barely represented) ---
-        current_matching = sum(1 for c in self.population if c.element == item)
+        current_matching = np.count_nonzero(self.elements[:self.size] == item)
         if current_matching < 3:
-            slots_available = self.carrying_capacity - len(self.population)
-            num_naive = min(8, max(0, slots_available))
-            for _ in range(num_naive):
-                self.population.append(ImmuneCell(
-                    element=item,
-                    affinity=1.0,
-                    age=0,
-                    generation=0
-                ))
+            slots_available = self.carrying_capacity - self.size
+            num_naive = min(self._NAIVE_BATCH, max(0, slots_available))
+            if num_naive:
+                self._append(item, 1.0, 0, num_naive)
 
     def query(self, item) -> float:
         """
@@ -324,91 +563,185 @@ class ClonalFrequencyEstimator:
         Returns estimated count (not proportion) for comparability with
         counter-based algorithms.
         """
-        if self.total_seen == 0 or not self.population:
+        if self.total_seen == 0 or not self.size:
+            return 0.0
+
+        # Never-seen elements have no id and therefore no cells; don't intern
+        # them, or false-positive probes would grow the id table
+        item = self._elem_id.get(item)
+        if item is None:
             return 0.0
 
         # Count cells matching this antigen
-        matching_cells = [c for c in self.population if c.element == item]
-        if not matching_cells:
+        affinity = self.affinity[:self.size]
+        matching = self.elements[:self.size] == item
+        if not matching.any():
             return 0.0
 
         # Weighted census: high-affinity cells count more (they represent
         # stronger evidence of repeated encounter)
-        weighted_count = sum(c.affinity for c in matching_cells)
-        total_weight = sum(c.affinity for c in self.population)
+        weighted_count = affinity[matching].sum()
+        total_weight = affinity.sum()
 
         if total_weight == 0:
             return 0.0
 
         # Convert population proportion to estimated count
         estimated_frequency = weighted_count / total_weight
-        return estimated_frequency * self.total_seen
+        return float(estimated_frequency * self.total_seen)
 
     def population_census(self) -> Dict:
         """Return population breakdown by element (for analysis)."""
-        census = defaultdict(lambda: {'count': 0, 'total_affinity': 0.0, 'avg_age': 0.0})
-        for cell in self.population:
-            census[cell.element]['count'] += 1
-            census[cell.element]['total_affinity'] += cell.affinity
-        for elem in census:
-            if census[elem]['count'] > 0:
-                matching = [c for c in self.population if c.element == elem]
-                census[elem]['avg_age'] = sum(c.age for c in matching) / len(matching)
-        return dict(census)
+        n = self.size
+        uniq, first, inv = np.unique(self.elements[:n], return_index=True,
+                                     return_inverse=True)
+        counts = np.bincount(inv, minlength=uniq.size)
+        aff_sum = np.bincount(inv, weights=self.affinity[:n], minlength=uniq.size)
+        age_sum = np.bincount(inv, weights=self.age[:n], minlength=uniq.size)
+        # Report species in order of first appearance in the population
+        order = np.argsort(first, kind='stable')
+        return {
+            self._elem_rev[elem]: {
+                'count': count,
+                'total_affinity': total_aff,
+                'avg_age': total_age / count,
+            }
+            for elem, count, total_aff, total_age in zip(
+                uniq[order].tolist(), counts[order].tolist(),
+                aff_sum[order].tolist(), age_sum[order].tolist())
+        }
 
     def memory_usage(self) -> int:
         """Memory in 'units': each cell stores element + affinity + age + generation."""
-        return len(self.population) * 4
+        return self.size * 4
 
 
 # ============================================================================
 # TEST HARNESS
 # ============================================================================
 
+@functools.lru_cache(maxsize=32)
+def zipf_probs(num_elements: int, alpha: float) -> np.ndarray:
+    """Normalized Zipf(alpha) probabilities for ranks 1..num_elements (read-only)."""
+    weights = 1.0 / np.arange(1, num_elements + 1, dtype=np.float64) ** alpha
+    probs = weights / weights.sum()
+    probs.flags.writeable = False
+    return probs
+
+
+@functools.lru_cache(maxsize=32)
+def _zipf_alias_table(num_elements: int, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Walker/Vose alias tables for Zipf(alpha) over ranks 0..num_elements-1.
+
+    Built once per (num_elements, alpha) in O(K); each sample then costs one
+    uniform rank draw plus one biased coin flip, independent of K.
+    """
+    scaled = (zipf_probs(num_elements, alpha) * num_elements).tolist()
+    prob = [1.0] * num_elements
+    alias = list(range(num_elements))
+    small = [i for i, q in enumerate(scaled) if q < 1.0]
+    large = [i for i, q in enumerate(scaled) if q >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Leftovers are 1.0 up to rounding error; they keep prob 1 / alias self
+    prob_arr = np.array(prob)
+    alias_arr = np.array(alias)
+    prob_arr.flags.writeable = False
+    alias_arr.flags.writeable = False
+    return prob_arr, alias_arr
+
+
 def generate_zipf_stream(n: int, num_elements: int, alpha: float = 1.2, seed: int = 123) -> List[int]:
     """Generate a Zipfian stream (realistic frequency distribution)."""
-    rng = random.Random(seed)
-    # Compute Zipf probabilities
-    weights = [1.0 / (i ** alpha) for i in range(1, num_elements + 1)]
-    total = sum(weights)
-    probs = [w / total for w in weights]
-    # Generate cumulative distribution for sampling
-    cum_probs = []
-    cumulative = 0.0
-    for p in probs:
-        cumulative += p
-        cum_probs.append(cumulative)
-
-    stream = []
-    for _ in range(n):
-        r = rng.random()
-        for i, cp in enumerate(cum_probs):
-            if r <= cp:
-                stream.append(i + 1)  # elements are 1-indexed
-                break
-    return stream
+    rng = np.random.default_rng(seed)
+    prob, alias = _zipf_alias_table(num_elements, alpha)
+    # Alias-method sampling, vectorized over the whole stream
+    ranks = rng.integers(num_elements, size=n)
+    ranks = np.where(rng.random(n) < prob[ranks], ranks, alias[ranks])
+    return (ranks + 1).tolist()  # elements are 1-indexed
+
+
+def exact_frequency_arrays(stream: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Ground truth as parallel (values, counts) arrays, values ascending.
+
+    Meant for 1-D integer streams; compute_exact_frequencies handles any
+    stream of hashables.
+    """
+    arr = np.asarray(stream)
+    if arr.dtype.kind in 'iu' and arr.size and 0 <= arr.min() and arr.max() <= 2 * arr.size:
+        # Small non-negative ids (every Zipf stream here): a linear-time
+        # bincount avoids np.unique's sort
+        counts = np.bincount(arr)
+        values = np.flatnonzero(counts)
+        counts = counts[values]
+    else:
+        values, counts = np.unique(arr, return_counts=True)
+    return values, counts
 
 
 def compute_exact_frequencies(stream: List[int]) -> Counter:
-    """Ground truth."""
-    return Counter(stream)
+    """
+    Ground truth as a Counter.
+
+    1-D integer streams are tallied in C; anything else (tuples, strings,
+    mixed types) is counted with Counter directly so keys keep their type.
+    """
+    try:
+        arr = np.asarray(stream)
+    except ValueError:  # ragged sequences, e.g. tuples of different lengths
+        return Counter(stream)
+    if arr.ndim != 1 or arr.dtype.kind not in 'iu':
+        return Counter(stream)
+    values, counts = exact_frequency_arrays(arr)
+    return Counter(dict(zip(values.tolist(), counts.tolist())))
+
+
+def top_k(values: np.ndarray, counts: np.ndarray, k: int) -> List[Tuple[int, int]]:
+    """
+    The k most frequent (value, count) pairs, like Counter.most_common(k).
+
+    np.partition finds the k-th largest count in linear time; everything at
+    or above it is then sorted stably so ties keep their array order.
+    """
+    if k < counts.size:
+        kth = -np.partition(-counts, k - 1)[k - 1]
+        idx = np.flatnonzero(counts >= kth)
+    else:
+        idx = np.arange(counts.size)
+    idx = idx[np.argsort(-counts[idx], kind='stable')[:k]]
+    return list(zip(values[idx].tolist(), counts[idx].tolist()))
 
 
 def evaluate_algorithm(algo, stream: List[int], exact: Counter, name: str) -> Dict:
     """
     Run algorithm on stream and compute error metrics.
+
+    The stream is only read, so one list can be shared across algorithms.
     """
-    # Process stream
-    for item in stream:
-        algo.update(item)
+    # Process stream (in one batch where the algorithm supports it)
+    if hasattr(algo, 'update_many'):
+        algo.update_many(stream)
+    else:
+        for item in stream:
+            algo.update(item)
 
     # Query all elements that appeared
+    items = exact.most_common()
+    all_elems = [elem for elem, _ in items]
     errors = []
     relative_errors = []
     results = {}
+    estimates = {}
 
-    for elem, true_count in exact.most_common():
+    for elem, true_count in items:
         estimated = algo.query(elem)
+        estimates[elem] = estimated
         error = abs(estimated - true_count)
         errors.append(error)
         if true_count > 0:
@@ -416,7 +749,7 @@ def evaluate_algorithm(algo, stream: List[int], exact: Counter, name: str) -> Di
         results[elem] = {'true': true_count, 'estimated': round(estimated, 1), 'error': round(error, 1)}
 
     # Also query some elements that did NOT appear (false positive test)
-    max_elem = max(exact.keys())
+    max_elem = max(all_elems)
     false_positive_errors = []
     for i in range(max_elem + 1, max_elem + 20):
         estimated = algo.query(i)
@@ -428,9 +761,11 @@ def evaluate_algorithm(algo, stream: List[int], exact: Counter, name: str) -> Di
     avg_fp = sum(false_positive_errors) / len(false_positive_errors) if false_positive_errors else 0
 
     # Top-10 accuracy (do we correctly identify the most frequent elements?)
-    true_top10 = set(elem for elem, _ in exact.most_common(10))
-    estimated_top10_items = sorted(exact.keys(), key=lambda e: algo.query(e), reverse=True)[:10]
-    top10_overlap = len(true_top10.intersection(set(estimated_top10_items)))
+    true_top10 = set(all_elems[:10])
+    # Candidates go in key order, not truth order, so ties between estimates
+    # are not broken in favour of the truly frequent elements
+    estimated_top10_items = heapq.nlargest(10, exact, key=estimates.__getitem__)
+    top10_overlap = len(true_top10.intersection(estimated_top10_items))
 
     return {
         'name': name,
@@ -442,7 +777,7 @@ def evaluate_algorithm(algo, stream: List[int], exact: Counter, name: str) -> Di
         'memory_units': algo.memory_usage(),
         'top5_results': {
             elem: results[elem]
-            for elem, _ in exact.most_common(5)
+            for elem in all_elems[:5]
         }
     }
 
@@ -451,12 +786,25 @@ def evaluate_algorithm(algo, stream: List[int], exact: Counter, name: str) -> Di
 # NOVELTY INDEX COMPUTATION
 # ============================================================================
 
-def compute_novelty_index(algorithm_description: Dict) -> Dict:
+class NoveltyInput(NamedTuple):
+    """Hashable description of an algorithm for compute_novelty_index."""
+    default_primitives_used: Tuple[str, ...] = ()
+    default_primitives_avoided: Tuple[str, ...] = ()
+    novel_primitives: Tuple[str, ...] = ()
+    # (aspect, commitment score) pairs
+    structural_commitment: Tuple[Tuple[str, float], ...] = ()
+
+
+@functools.lru_cache(maxsize=None)
+def compute_novelty_index(algorithm_description: NoveltyInput) -> Dict:
     """
     Compute the novelty index N and commitment function κ for an algorithm.
 
     N measures distance from the highest-probability solution primitives.
     κ measures whether cross-domain structure is load-bearing or decorative.
+
+    Results are memoized per description; treat the returned dict as
+    read-only.
     """
     # Define the default-axis primitives and their activation levels
     default_primitives = {
@@ -471,9 +819,9 @@ def compute_novelty_index(algorithm_description: Dict) -> Dict:
     }
 
     # Compute how many default primitives the algorithm uses
-    primitives_used = algorithm_description.get('default_primitives_used', [])
-    primitives_avoided = algorithm_description.get('default_primitives_avoided', [])
-    novel_primitives = algorithm_description.get('novel_primitives', [])
+    primitives_used = list(algorithm_description.default_primitives_used)
+    primitives_avoided = list(algorithm_description.default_primitives_avoided)
+    novel_primitives = list(algorithm_description.novel_primitives)
 
     # Novelty index: weighted distance from defaults
     default_activation_sum = sum(
@@ -487,7 +835,7 @@ def compute_novelty_index(algorithm_description: Dict) -> Dict:
         N = 1.0
 
     # Commitment function κ
-    structural_aspects = algorithm_description.get('structural_commitment', {})
+    structural_aspects = dict(algorithm_description.structural_commitment)
     if structural_aspects:
         kappa = sum(structural_aspects.values()) / len(structural_aspects)
     else:
@@ -502,10 +850,97 @@ def compute_novelty_index(algorithm_description: Dict) -> Dict:
     }
 
 
+CMS_NOVELTY_INPUT = NoveltyInput(
+    default_primitives_used=('hashing', 'counter_array', 'min_aggregation',
+                             'probabilistic_guarantee', 'epsilon_delta_params',
+                             'single_pass', 'sublinear_space'),
+    default_primitives_avoided=(),
+    novel_primitives=(),
+    structural_commitment=(),  # No cross-domain structure
+)
+
+RFE_NOVELTY_INPUT = NoveltyInput(
+    default_primitives_used=('hashing', 'counter_array', 'median_of_means',
+                             'probabilistic_guarantee', 'single_pass',
+                             'sublinear_space'),
+    default_primitives_avoided=('min_aggregation',),
+    novel_primitives=(),  # 'Resonance' is decorative, not novel
+    structural_commitment=(
+        ('data_structure', 0.1),   # Complex accumulators = signed counters
+        ('insertion', 0.05),       # Phase addition = hash + increment
+        ('memory_mgmt', 0.1),      # Same as sketch
+        ('query', 0.1),            # Projection = sketch query
+        ('error_source', 0.05),    # Phase collision = hash collision
+        ('extra_dimension', 0.0),  # None
+    ),
+)
+
+CLOFE_NOVELTY_INPUT = NoveltyInput(
+    default_primitives_used=('single_pass',),  # Only this is shared
+    default_primitives_avoided=('hashing', 'counter_array', 'min_aggregation',
+                                'median_of_means', 'probabilistic_guarantee',
+                                'epsilon_delta_params'),
+    novel_primitives=(
+        'clonal_expansion',
+        'affinity_maturation',
+        'competitive_apoptosis',
+        'population_census_query',
+        'carrying_capacity_homeostasis',
+        'naive_cell_recruitment',
+    ),
+    structural_commitment=(
+        ('data_structure', 0.9),       # Population of cells IS the structure
+        ('insertion', 0.85),           # Clonal expansion IS the mechanism
+        ('memory_mgmt', 0.9),          # Apoptosis IS memory management
+        ('query', 0.8),                # Population census IS the query
+        ('error_source', 0.85),        # Stochastic drift IS the error
+        ('extra_dimension', 0.95),     # Affinity has NO sketch analogue
+    ),
+)
+
+
 # ============================================================================
 # MAIN EXPERIMENT
 # ============================================================================
 
+def _run_trial(trial: int, stream_length: int, num_elements: int,
+               alpha: float) -> Tuple[Dict, Dict]:
+    """One repeatability trial: fresh stream, fresh CMS and CloFE (seed 200+trial)."""
+    seed = 200 + trial
+    test_stream = generate_zipf_stream(stream_length, num_elements, alpha, seed=seed)
+    test_exact = compute_exact_frequencies(test_stream)
+
+    trial_cms = CountMinSketch(width=100, depth=5, seed=seed)
+    trial_clofe = ClonalFrequencyEstimator(carrying_capacity=2000, seed=seed)
+
+    cms_r = evaluate_algorithm(trial_cms, test_stream, test_exact, "CMS")
+    clofe_r = evaluate_algorithm(trial_clofe, test_stream, test_exact, "CloFE")
+    return cms_r, clofe_r
+
+
+def _fmt_results(r: Dict) -> str:
+    """Top-5 estimates from evaluate_algorithm(), one element per line."""
+    return '\n'.join(f"    {elem}: {info!r}" for elem, info in r['top5_results'].items())
+
+
+def _print_algo_section(header: str, mechanism: str, default: str, r: Dict) -> None:
+    """Print one algorithm's header and evaluation metrics."""
+    print("-" * 72)
+    print(header)
+    print(f"  Mechanism: {mechanism}")
+    print(f"  Default axis: {default}")
+    print("-" * 72)
+    print(f"  Avg absolute error:  {r['avg_absolute_error']}")
+    print(f"  Max absolute error:  {r['max_absolute_error']}")
+    print(f"  Avg relative error:  {r['avg_relative_error']}")
+    print(f"  Avg false positive:  {r['avg_false_positive']}")
+    print(f"  Top-10 accuracy:     {r['top10_accuracy']}/10")
+    print(f"  Memory units:        {r['memory_units']}")
+    print("  Top 5 estimates:")
+    print(_fmt_results(r))
+    print()
+
+
 def run_experiment():
     print("=" * 72)
     print("NOVEL AXIS PRINCIPLE — PROOF OF CONCEPT EXPERIMENT")
@@ -521,67 +956,40 @@ def run_experiment():
     print(f"Stream: {STREAM_LENGTH} elements, {NUM_ELEMENTS} distinct, Zipf(α={ZIPF_ALPHA})")
     stream = generate_zipf_stream(STREAM_LENGTH, NUM_ELEMENTS, ZIPF_ALPHA)
     exact = compute_exact_frequencies(stream)
-    print(f"Top 5 true frequencies: {exact.most_common(5)}")
+    print(f"Top 5 true frequencies: {top_k(*exact_frequency_arrays(stream), 5)}")
     print()
 
     # --- Run algorithms ---
-    print("-" * 72)
-    print("ALGORITHM 1: Count-Min Sketch (Standard Baseline)")
-    print("  Mechanism: Hashing + counters")
-    print("  Default axis: YES (this IS the default)")
-    print("-" * 72)
     cms = CountMinSketch(width=100, depth=5)
     cms_results = evaluate_algorithm(cms, stream, exact, "Count-Min Sketch")
-    print(f"  Avg absolute error:  {cms_results['avg_absolute_error']}")
-    print(f"  Max absolute error:  {cms_results['max_absolute_error']}")
-    print(f"  Avg relative error:  {cms_results['avg_relative_error']}")
-    print(f"  Avg false positive:  {cms_results['avg_false_positive']}")
-    print(f"  Top-10 accuracy:     {cms_results['top10_accuracy']}/10")
-    print(f"  Memory units:        {cms_results['memory_units']}")
-    print(f"  Top 5 estimates:     {json.dumps(cms_results['top5_results'], indent=4)}")
-    print()
-
-    # Re-generate stream (algorithms consume it)
-    stream = generate_zipf_stream(STREAM_LENGTH, NUM_ELEMENTS, ZIPF_ALPHA)
+    _print_algo_section(
+        "ALGORITHM 1: Count-Min Sketch (Standard Baseline)",
+        "Hashing + counters",
+        "YES (this IS the default)",
+        cms_results,
+    )
 
-    print("-" * 72)
-    print("ALGORITHM 2: Resonance Frequency Estimator (Low-κ Negative Control)")
-    print("  Mechanism: 'Wave interference' (= Count Sketch in disguise)")
-    print("  Default axis: YES (despite physics vocabulary)")
-    print("-" * 72)
     rfe = ResonanceFrequencyEstimator(num_oscillators=100, num_banks=5)
     rfe_results = evaluate_algorithm(rfe, stream, exact, "Resonance FE (κ≈0.08)")
-    print(f"  Avg absolute error:  {rfe_results['avg_absolute_error']}")
-    print(f"  Max absolute error:  {rfe_results['max_absolute_error']}")
-    print(f"  Avg relative error:  {rfe_results['avg_relative_error']}")
-    print(f"  Avg false positive:  {rfe_results['avg_false_positive']}")
-    print(f"  Top-10 accuracy:     {rfe_results['top10_accuracy']}/10")
-    print(f"  Memory units:        {rfe_results['memory_units']}")
-    print(f"  Top 5 estimates:     {json.dumps(rfe_results['top5_results'], indent=4)}")
-    print()
-
-    # Re-generate stream
-    stream = generate_zipf_stream(STREAM_LENGTH, NUM_ELEMENTS, ZIPF_ALPHA)
+    _print_algo_section(
+        "ALGORITHM 2: Resonance Frequency Estimator (Low-κ Negative Control)",
+        "'Wave interference' (= Count Sketch in disguise)",
+        "YES (despite physics vocabulary)",
+        rfe_results,
+    )
 
-    print("-" * 72)
-    print("ALGORITHM 3: CloFE — Clonal Frequency Estimator (Novel, High-κ)")
-    print("  Mechanism: Adaptive immune clonal selection dynamics")
-    print("  Default axis: NO (genuinely novel structural approach)")
-    print("-" * 72)
     clofe = ClonalFrequencyEstimator(
         carrying_capacity=2000,
         max_clone_fraction=0.08,
         regulatory_strength=0.7,
     )
     clofe_results = evaluate_algorithm(clofe, stream, exact, "CloFE (κ≈0.85)")
-    print(f"  Avg absolute error:  {clofe_results['avg_absolute_error']}")
-    print(f"  Max absolute error:  {clofe_results['max_absolute_error']}")
-    print(f"  Avg relative error:  {clofe_results['avg_relative_error']}")
-    print(f"  Avg false positive:  {clofe_results['avg_false_positive']}")
-    print(f"  Top-10 accuracy:     {clofe_results['top10_accuracy']}/10")
-    print(f"  Memory units:        {clofe_results['memory_units']}")
-    print(f"  Top 5 estimates:     {json.dumps(clofe_results['top5_results'], indent=4)}")
-    print()
+    _print_algo_section(
+        "ALGORITHM 3: CloFE — Clonal Frequency Estimator (Novel, High-κ)",
+        "Adaptive immune clonal selection dynamics",
+        "NO (genuinely novel structural approach)",
+        clofe_results,
+    )
 
     # Population census for CloFE
     census = clofe.population_census()
@@ -599,63 +1007,21 @@ def run_experiment():
     print("=" * 72)
     print()
 
-    cms_novelty = compute_novelty_index({
-        'default_primitives_used': ['hashing', 'counter_array', 'min_aggregation',
-                                     'probabilistic_guarantee', 'epsilon_delta_params',
-                                     'single_pass', 'sublinear_space'],
-        'default_primitives_avoided': [],
-        'novel_primitives': [],
-        'structural_commitment': {},  # No cross-domain structure
-    })
+    cms_novelty = compute_novelty_index(CMS_NOVELTY_INPUT)
     print(f"Count-Min Sketch:")
     print(f"  Novelty Index N = {cms_novelty['novelty_index_N']}")
     print(f"  Commitment κ = {cms_novelty['commitment_kappa']}")
     print(f"  (Baseline: IS the default axis)")
     print()
 
-    rfe_novelty = compute_novelty_index({
-        'default_primitives_used': ['hashing', 'counter_array', 'median_of_means',
-                                     'probabilistic_guarantee', 'single_pass',
-                                     'sublinear_space'],
-        'default_primitives_avoided': ['min_aggregation'],
-        'novel_primitives': [],  # 'Resonance' is decorative, not novel
-        'structural_commitment': {
-            'data_structure': 0.1,   # Complex accumulators = signed counters
-            'insertion': 0.05,       # Phase addition = hash + increment
-            'memory_mgmt': 0.1,      # Same as sketch
-            'query': 0.1,            # Projection = sketch query
-            'error_source': 0.05,    # Phase collision = hash collision
-            'extra_dimension': 0.0,  # None
-        },
-    })
+    rfe_novelty = compute_novelty_index(RFE_NOVELTY_INPUT)
     print(f"Resonance FE (negative control):")
     print(f"  Novelty Index N = {rfe_novelty['novelty_index_N']}")
     print(f"  Commitment κ = {rfe_novelty['commitment_kappa']}")
     print(f"  (LSR IN CODE: physics vocabulary decorating standard sketch)")
     print()
 
-    clofe_novelty = compute_novelty_index({
-        'default_primitives_used': ['single_pass'],  # Only this is shared
-        'default_primitives_avoided': ['hashing', 'counter_array', 'min_aggregation',
-                                        'median_of_means', 'probabilistic_guarantee',
-                                        'epsilon_delta_params'],
-        'novel_primitives': [
-            'clonal_expansion',
-            'affinity_maturation',
-            'competitive_apoptosis',
-            'population_census_query',
-            'carrying_capacity_homeostasis',
-            'naive_cell_recruitment',
-        ],
-        'structural_commitment': {
-            'data_structure': 0.9,       # Population of cells IS the structure
-            'insertion': 0.85,           # Clonal expansion IS the mechanism
-            'memory_mgmt': 0.9,          # Apoptosis IS memory management
-            'query': 0.8,                # Population census IS the query
-            'error_source': 0.85,        # Stochastic drift IS the error
-            'extra_dimension': 0.95,     # Affinity has NO sketch analogue
-        },
-    })
+    clofe_novelty = compute_novelty_index(CLOFE_NOVELTY_INPUT)
     print(f"CloFE (novel algorithm):")
     print(f"  Novelty Index N = {clofe_novelty['novelty_index_N']}")
     print(f"  Commitment κ = {clofe_novelty['commitment_kappa']}")
@@ -702,18 +1068,13 @@ def run_experiment():
     print("=" * 72)
     print()
 
-    for trial in range(5):
-        seed = 200 + trial
-        test_stream = generate_zipf_stream(STREAM_LENGTH, NUM_ELEMENTS, ZIPF_ALPHA, seed=seed)
-        test_exact = compute_exact_frequencies(test_stream)
-
-        trial_cms = CountMinSketch(width=100, depth=5, seed=seed)
-        trial_clofe = ClonalFrequencyEstimator(carrying_capacity=2000, seed=seed)
-
-        cms_r = evaluate_algorithm(trial_cms, test_stream, test_exact, "CMS")
-        test_stream = generate_zipf_stream(STREAM_LENGTH, NUM_ELEMENTS, ZIPF_ALPHA, seed=seed)
-        clofe_r = evaluate_algorithm(trial_clofe, test_stream, test_exact, "CloFE")
+    # Trials are independent (own stream, own seeds), so run them in worker
+    # processes; CloFE's update loop is CPU-bound and holds the GIL.
+    trial_args = [(trial, STREAM_LENGTH, NUM_ELEMENTS, ZIPF_ALPHA) for trial in range(5)]
+    with multiprocessing.Pool(5) as pool:
+        trial_results = pool.starmap(_run_trial, trial_args)
 
+    for trial, (cms_r, clofe_r) in enumerate(trial_results):
         print(f"  Trial {trial + 1}: CMS avg_rel_err={cms_r['avg_relative_error']:.4f}, "
               f"top10={cms_r['top10_accuracy']}/10  |  "
               f"CloFE avg_rel_err={clofe_r['avg_relative_error']:.4f}, "
@@ -731,53 +1092,30 @@ def run_experiment():
     print("Query: frequencies for Phase 2 ONLY (post-shift)")
     print()
 
+    # Both phases draw from the same Zipf(1.2) shape over 50 ranks; sampling
+    # is vectorized (binary search over the CDF in C) rather than a Python
+    # linear scan per draw.
+    rng_shift = np.random.default_rng(999)
+    shift_cum = np.cumsum(zipf_probs(50, 1.2))
+    shift_cum /= shift_cum[-1]
+
     # Phase 1: elements 1-50 are frequent
-    rng_shift = random.Random(999)
-    phase1_weights = [1.0 / (i ** 1.2) for i in range(1, 51)]
-    phase1_total = sum(phase1_weights)
-    phase1_probs = [w / phase1_total for w in phase1_weights]
-    phase1_cum = []
-    c = 0.0
-    for p in phase1_probs:
-        c += p
-        phase1_cum.append(c)
-
-    phase1_stream = []
-    for _ in range(25000):
-        r = rng_shift.random()
-        for i, cp in enumerate(phase1_cum):
-            if r <= cp:
-                phase1_stream.append(i + 1)
-                break
+    phase1_arr = (np.searchsorted(shift_cum, rng_shift.random(25000), side='right')
+                  .astype(np.int32) + 1)
 
     # Phase 2: elements 151-200 are frequent (complete shift)
-    phase2_weights = [1.0 / (i ** 1.2) for i in range(1, 51)]
-    phase2_total = sum(phase2_weights)
-    phase2_probs = [w / phase2_total for w in phase2_weights]
-    phase2_cum = []
-    c = 0.0
-    for p in phase2_probs:
-        c += p
-        phase2_cum.append(c)
-
-    phase2_stream = []
-    for _ in range(25000):
-        r = rng_shift.random()
-        for i, cp in enumerate(phase2_cum):
-            if r <= cp:
-                phase2_stream.append(150 + i + 1)  # elements 151-200
-                break
-
-    full_stream = phase1_stream + phase2_stream
-    phase2_exact = compute_exact_frequencies(phase2_stream)
+    phase2_arr = (np.searchsorted(shift_cum, rng_shift.random(25000), side='right')
+                  .astype(np.int32) + 151)
+
+    full_arr = np.concatenate([phase1_arr, phase2_arr])
+    phase2_top10 = top_k(*exact_frequency_arrays(phase2_arr), 10)
 
     # Run CMS on full stream, query Phase 2 elements
     shift_cms = CountMinSketch(width=100, depth=5, seed=999)
-    for item in full_stream:
-        shift_cms.update(item)
+    shift_cms.update_many(full_arr)
 
     cms_shift_errors = []
-    for elem, true_count in phase2_exact.most_common(10):
+    for elem, true_count in phase2_top10:
         est = shift_cms.query(elem)
         # CMS gives total count (phase1 + phase2), but true count is phase2 only
         # Since these elements didn't appear in phase1, CMS estimate = phase2 count + noise
@@ -787,20 +1125,18 @@ def run_experiment():
     # Run CloFE on full stream, query Phase 2 elements
     shift_clofe = ClonalFrequencyEstimator(carrying_capacity=2000, seed=999)
     # Feed phase 1
-    for item in phase1_stream:
-        shift_clofe.update(item)
+    shift_clofe.update_many(phase1_arr)
 
     # Snapshot: how many distinct elements tracked after phase 1?
-    phase1_species = len(set(c.element for c in shift_clofe.population))
+    phase1_species = len(np.unique(shift_clofe.elements[:shift_clofe.size]))
 
     # Feed phase 2
-    for item in phase2_stream:
-        shift_clofe.update(item)
+    shift_clofe.update_many(phase2_arr)
 
-    phase2_species = len(set(c.element for c in shift_clofe.population))
+    phase2_species = len(np.unique(shift_clofe.elements[:shift_clofe.size]))
 
     clofe_shift_errors = []
-    for elem, true_count in phase2_exact.most_common(10):
+    for elem, true_count in phase2_top10:
         # CloFE query returns estimate scaled to total_seen (50000),
         # but we want phase2 frequency. Scale by phase2 proportion.
         raw_est = shift_clofe.query(elem)
@@ -834,16 +1170,15 @@ def run_experiment():
     print("=" * 72)
     print()
 
-    all_elements = set(full_stream)
-    absent_elements = [i for i in range(1000, 1050)]  # guaranteed absent
+    absent_elements = range(1000, 1050)  # guaranteed absent
 
-    cms_fp = [shift_cms.query(e) for e in absent_elements]
-    clofe_fp = [shift_clofe.query(e) for e in absent_elements]
+    cms_fp = np.array([shift_cms.query(e) for e in absent_elements])
+    clofe_fp = np.array([shift_clofe.query(e) for e in absent_elements])
 
-    print(f"CMS false positives:   avg={sum(cms_fp)/len(cms_fp):.1f}, "
-          f"max={max(cms_fp)}, min={min(cms_fp)}")
-    print(f"CloFE false positives: avg={sum(clofe_fp)/len(clofe_fp):.1f}, "
-          f"max={max(clofe_fp):.1f}, min={min(clofe_fp):.1f}")
+    print(f"CMS false positives:   avg={cms_fp.mean():.1f}, "
+          f"max={cms_fp.max()}, min={cms_fp.min()}")
+    print(f"CloFE false positives: avg={clofe_fp.mean():.1f}, "
+          f"max={clofe_fp.max():.1f}, min={clofe_fp.min():.1f}")
     print()
     print("CloFE ALWAYS returns 0 for unseen elements (no hash collisions).")
     print("CMS overestimates due to hash collision noise.")
@@ -10,21 +10,26 @@ Adds:
 - Per-domain Fisher tests
 """
 
+import functools
 import json
 import math
+from math import asin as _asin, sqrt as _sqrt
 
 # ============================================================================
-# FISHER'S EXACT TEST (pure Python, no scipy needed)
+# FISHER'S EXACT TEST (pure Python)
 # ============================================================================
 
+# _LOG_FACT[n] = log(n!), grown on demand and shared across calls
+_LOG_FACT = [0.0, 0.0]
+
+
 def log_factorial(n):
-    """Log factorial using Stirling's approximation for large n."""
+    """Log factorial, looked up in a cumulative table extended as needed."""
     if n <= 1:
         return 0.0
-    result = 0.0
-    for i in range(2, n + 1):
-        result += math.log(i)
-    return result
+    while len(_LOG_FACT) <= n:
+        _LOG_FACT.append(_LOG_FACT[-1] + math.log(len(_LOG_FACT)))
+    return _LOG_FACT[n]
 
 
 def hypergeometric_pmf(k, N, K, n):
@@ -38,6 +43,47 @@ def hypergeometric_pmf(k, N, K, n):
     return math.exp(log_p)
 
 
+@functools.lru_cache(maxsize=None)
+def hypergeometric_pmf_support(N, K, n):
+    """
+    P(X=k) for every k in the hypergeometric support, in one pass.
+
+    Returns (k_min, pmfs) with pmfs[i] = P(X = k_min + i), cached per
+    (N, K, n) margin set. Only the mode is computed from log-factorials; the
+    rest follows from P(X=k+1) = P(X=k) * (K-k)(n-k) / ((k+1)(N-K-n+k+1)),
+    stepping outwards from the mode so no term starts from an underflow.
+    """
+    k_min = max(0, n + K - N)
+    k_max = min(K, n)
+    mode = min(max((n + 1) * (K + 1) // (N + 2), k_min), k_max)
+    pmfs = [0.0] * (k_max - k_min + 1)
+    p_mode = pmfs[mode - k_min] = hypergeometric_pmf(mode, N, K, n)
+    p_k = p_mode
+    for k in range(mode, k_max):
+        p_k *= (K - k) * (n - k) / ((k + 1) * (N - K - n + k + 1))
+        pmfs[k + 1 - k_min] = p_k
+    p_k = p_mode
+    for k in range(mode, k_min, -1):
+        p_k *= k * (N - K - n + k) / ((K - k + 1) * (n - k + 1))
+        pmfs[k - 1 - k_min] = p_k
+    return k_min, tuple(pmfs)
+
+
+@functools.lru_cache(maxsize=None)
+def hypergeometric_upper_tails(N, K, n):
+    """
+    Returns (k_min, tails) with tails[i] = P(X >= k_min + i), cached per
+    (N, K, n) so tables sharing margins reuse one lookup table.
+    """
+    k_min, pmfs = hypergeometric_pmf_support(N, K, n)
+    tails = []
+    acc = 0.0
+    for p_k in reversed(pmfs):  # smallest terms first
+        acc += p_k
+        tails.append(acc)
+    return k_min, tuple(reversed(tails))
+
+
 def fishers_exact_test(a, b, c, d):
     """
     Fisher's exact test for 2x2 contingency table:
@@ -51,12 +97,29 @@ def fishers_exact_test(a, b, c, d):
     K = a + c  # total flagged
     n = a + b  # total LLM
 
-    # P-value: sum of probabilities for outcomes as extreme or more extreme
-    p_value = 0.0
-    for k in range(a, min(K, n) + 1):
-        p_value += hypergeometric_pmf(k, N, K, n)
+    # P-value: sum of probabilities for outcomes as extreme or more extreme,
+    # read from the upper-tail table for these margins
+    k_min, tails = hypergeometric_upper_tails(N, K, n)
+    return tails[a - k_min]
 
-    return p_value
+
+def fishers_exact_test_batch(tables):
+    """
+    One-sided Fisher's exact p-values for a list of (a, b, c, d) tables.
+
+    Tables are grouped by their margins (N, K, n), and each group reads all
+    its p-values from one upper-tail table, exactly as fishers_exact_test
+    would.
+    """
+    groups = {}
+    for i, (a, b, c, d) in enumerate(tables):
+        groups.setdefault((a + b + c + d, a + c, a + b), []).append(i)
+    p_values = [0.0] * len(tables)
+    for (N, K, n), indices in groups.items():
+        k_min, tails = hypergeometric_upper_tails(N, K, n)
+        for i in indices:
+            p_values[i] = tails[tables[i][0] - k_min]
+    return p_values
 
 
 def fishers_exact_two_sided(a, b, c, d):
@@ -65,15 +128,13 @@ def fishers_exact_two_sided(a, b, c, d):
     K = a + c
     n = a + b
 
+    k_min, pmfs = hypergeometric_pmf_support(N, K, n)
+
     # Observed probability
-    p_obs = hypergeometric_pmf(a, N, K, n)
+    p_obs = pmfs[a - k_min]
 
     # Sum all probabilities <= p_obs
-    p_value = 0.0
-    for k in range(max(0, n + K - N), min(K, n) + 1):
-        p_k = hypergeometric_pmf(k, N, K, n)
-        if p_k <= p_obs + 1e-10:
-            p_value += p_k
+    p_value = sum(p_k for p_k in pmfs if p_k <= p_obs + 1e-10)
 
     return min(p_value, 1.0)
 
@@ -123,14 +184,26 @@ def beta_incomplete_cf(a, b, x, max_iter=200, tol=1e-10):
     return f
 
 
-def beta_inc(a, b, x):
-    """Regularized incomplete beta function I_x(a,b)."""
+def log_beta_fn(a, b):
+    """log B(a,b); exact via log_factorial for positive integer a, b."""
+    if a == int(a) and b == int(b) and a > 0 and b > 0:
+        return log_factorial(int(a) - 1) + log_factorial(int(b) - 1) - log_factorial(int(a + b) - 1)
+    return math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b)
+
+
+def beta_inc(a, b, x, log_beta=None):
+    """Regularized incomplete beta function I_x(a,b).
+
+    `log_beta` may be passed in when the caller evaluates many x for the
+    same (a, b).
+    """
     if x <= 0:
         return 0.0
     if x >= 1:
         return 1.0
 
-    log_beta = log_factorial(int(a) - 1) + log_factorial(int(b) - 1) - log_factorial(int(a + b) - 1) if (a == int(a) and b == int(b) and a > 0 and b > 0) else (math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b))
+    if log_beta is None:
+        log_beta = log_beta_fn(a, b)
 
     prefix = math.exp(a * math.log(x) + b * math.log(1 - x) - log_beta)
 
@@ -165,17 +238,29 @@ def binomial_ci_clopper_pearson(k, n, alpha=0.05):
 
 
 def _beta_quantile(a, b, p, tol=1e-8):
-    """Find x such that I_x(a,b) = p using bisection."""
+    """Find x such that I_x(a,b) = p using Newton's method.
+
+    The derivative of I_x(a,b) is the beta pdf, so each step costs one
+    beta_inc call. A bracket on the root is kept, and any step that would
+    leave it falls back to bisection.
+    """
+    log_beta = log_beta_fn(a, b)
     lo, hi = 0.0, 1.0
+    x = a / (a + b)
     for _ in range(100):
-        mid = (lo + hi) / 2
-        if beta_inc(a, b, mid) < p:
-            lo = mid
+        f = beta_inc(a, b, x, log_beta) - p
+        if abs(f) < 1e-10:
+            break
+        if f < 0:
+            lo = x
         else:
-            hi = mid
+            hi = x
         if hi - lo < tol:
             break
-    return (lo + hi) / 2
+        pdf = math.exp((a - 1) * math.log(x) + (b - 1) * math.log(1 - x) - log_beta)
+        x_next = x - f / pdf if pdf > 0 else lo
+        x = x_next if lo < x_next < hi else (lo + hi) / 2
+    return x
 
 
 # ============================================================================
@@ -184,7 +269,7 @@ def _beta_quantile(a, b, p, tol=1e-8):
 
 def cohens_h(p1, p2):
     """Cohen's h effect size for difference in proportions."""
-    return 2 * math.asin(math.sqrt(p1)) - 2 * math.asin(math.sqrt(p2))
+    return 2 * _asin(_sqrt(p1)) - 2 * _asin(_sqrt(p2))
 
 
 # ============================================================================
@@ -294,16 +379,16 @@ if __name__ == "__main__":
         "blacksmith":  {"human_lsr": 0, "human_n": 5, "llm_lsr": 1, "llm_n": 4},
     }
 
-    for domain, data in domains.items():
+    domain_tables = []
+    for data in domains.values():
         # Passage-level: any LSR vs no LSR
         llm_flagged = min(data["llm_lsr"], data["llm_n"])  # cap at n
         human_flagged = min(data["human_lsr"], data["human_n"])
-        a = llm_flagged
-        b = data["llm_n"] - a
-        c = human_flagged
-        d = data["human_n"] - c
+        domain_tables.append((llm_flagged, data["llm_n"] - llm_flagged,
+                              human_flagged, data["human_n"] - human_flagged))
+    domain_p = fishers_exact_test_batch(domain_tables)
 
-        p = fishers_exact_test(a, b, c, d)
+    for (domain, data), (a, b, c, d), p in zip(domains.items(), domain_tables, domain_p):
         print(f"  {domain:<20} LLM {a}/{data['llm_n']} vs Human {c}/{data['human_n']}  "
               f"p = {p:.4f}{'  *' if p < 0.05 else ''}")
 
@@ -23,14 +23,32 @@ Authors: Richard Quinn & Claude Opus 4 (Anthropic)
 Date: 22 February 2026
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import os
-import re
 import time
-import urllib.request
-import urllib.error
 from collections import Counter
 
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2 = True
+except ImportError:  # optional: lets httpx multiplex concurrent calls on one connection
+    HTTP2 = False
+
+try:
+    import ahocorasick
+except ImportError:  # optional: analyze_probe falls back to tokenize()
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # optional: API payloads go through stdlib json instead
+    orjson = None
+
 # ============================================================================
 # PROBE DEFINITIONS
 # ============================================================================
@@ -151,98 +169,243 @@ PROBES = [
 ]
 
 N_SAMPLES = 20  # completions per probe per model
+TEMPERATURE = 1.0  # sampling temperature for every probe completion
+
+# probe id -> (literary words, equivalent words), built once at import
+PROBE_WORD_SETS = {
+    probe["id"]: (frozenset(probe["literary_words"]),
+                  frozenset(probe["equivalent_words"]))
+    for probe in PROBES
+}
+
+# Connections are kept alive for the whole run. httpx's default 5s expiry
+# would drop them between OpenAI's rate-limited calls and redo TLS each time.
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32,
+                           keepalive_expiry=120)
+
+
+def make_client():
+    """The pooled HTTP client shared by every API call in a run."""
+    return httpx.AsyncClient(http2=HTTP2, timeout=60, limits=HTTP_LIMITS)
 
 
 # ============================================================================
 # API CALLERS
 # ============================================================================
 
-def call_anthropic(prompt, api_key, model="claude-sonnet-4-20250514"):
-    """Generate a single completion via Anthropic API."""
+def _encode(payload):
+    """Serialize a request body to bytes."""
+    return orjson.dumps(payload) if orjson else json.dumps(payload).encode()
+
+
+def _decode(resp):
+    """Parse a response body straight from bytes."""
+    return orjson.loads(resp.content) if orjson else json.loads(resp.content)
+
+
+def _retry_after(response, default=10.0):
+    """Seconds to wait from a Retry-After header (delta-seconds form)."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", default)))
+    except ValueError:  # HTTP-date form
+        return default
+
+
+class RetryAborted(Exception):
+    """A retryable failure given up on because with_retry's `stop` was set."""
+
+
+def with_retry(fn, bucket=None, max_attempts=3, on_retry=None, stop=None):
+    """
+    Retry an async API caller on failures worth retrying: a 429 waits for
+    its Retry-After, 5xx responses and network errors back off 1s, 2s, ...;
+    any other 4xx (bad key, bad request) is raised immediately. Each retry
+    also waits for a `bucket` token, so retries count against the rate limit
+    like any other request (the caller paces the first attempt).
+
+    on_retry(exc) is called for every failure that would be retried, e.g.
+    to count it towards a circuit breaker. If stop() is then true, or turns
+    true during the backoff, the failure is raised as RetryAborted instead
+    of being retried.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        for attempt in range(max_attempts):
+            try:
+                return await fn(*args, **kwargs)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if attempt == max_attempts - 1 or not (status == 429 or status >= 500):
+                    raise
+                error = e
+                delay = _retry_after(e.response) if status == 429 else 2 ** attempt
+            except httpx.TransportError as e:
+                if attempt == max_attempts - 1:
+                    raise
+                error = e
+                delay = 2 ** attempt
+            if on_retry is not None:
+                on_retry(error)
+            if stop is not None and stop():
+                raise RetryAborted(str(error)) from error
+            await asyncio.sleep(delay)
+            if stop is not None and stop():
+                raise RetryAborted(str(error)) from error
+            if bucket is not None:
+                await bucket.acquire()
+    return wrapper
+
+
+# Running input-token usage reported by Anthropic, including prompt-cache
+# reads/writes, so cache hit rates can be checked after a run.
+ANTHROPIC_USAGE = Counter()
+
+
+async def call_anthropic(client, prompt, api_key, model="claude-sonnet-4-20250514", n=1):
+    """Generate a completion via Anthropic API (one per request; n must be 1)."""
+    if n != 1:
+        raise ValueError("the Anthropic Messages API returns one completion per request")
     url = "https://api.anthropic.com/v1/messages"
     headers = {
         "x-api-key": api_key,
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
-    data = json.dumps({
+    payload = {
         "model": model,
         "max_tokens": 400,
-        "temperature": 1.0,
-        "messages": [{"role": "user", "content": prompt}],
-    }).encode()
+        "temperature": TEMPERATURE,
+        # Every sample repeats the same prompt, so mark it cacheable. The
+        # API ignores the marker for prompts under its minimum cache length.
+        "messages": [{"role": "user", "content": [{
+            "type": "text",
+            "text": prompt,
+            "cache_control": {"type": "ephemeral"},
+        }]}],
+    }
 
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        result = json.loads(resp.read().decode())
-    return result["content"][0]["text"]
+    resp = await client.post(url, content=_encode(payload), headers=headers, timeout=30)
+    resp.raise_for_status()
+    result = _decode(resp)
+    ANTHROPIC_USAGE.update({k: v for k, v in result.get("usage", {}).items()
+                            if k.endswith("input_tokens") and isinstance(v, int)})
+    return [result["content"][0]["text"]]
 
 
-def call_openai(prompt, api_key, model="gpt-4o"):
-    """Generate a single completion via OpenAI API."""
+async def call_openai(client, prompt, api_key, model="gpt-4o", n=1):
+    """Generate n completions of one prompt in a single OpenAI API request."""
     url = "https://api.openai.com/v1/chat/completions"
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
-    data = json.dumps({
+    payload = {
         "model": model,
         "max_tokens": 400,
-        "temperature": 1.0,
+        "temperature": TEMPERATURE,
+        "n": n,
         "messages": [{"role": "user", "content": prompt}],
-    }).encode()
+    }
 
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        result = json.loads(resp.read().decode())
-    return result["choices"][0]["message"]["content"]
+    resp = await client.post(url, content=_encode(payload), headers=headers, timeout=60)
+    resp.raise_for_status()
+    result = _decode(resp)
+    return [choice["message"]["content"] for choice in result["choices"]]
 
 
-def call_gemini(prompt, api_key, model="gemini-2.5-flash"):
-    """Generate a single completion via Gemini API."""
+async def call_gemini(client, prompt, api_key, model="gemini-2.5-flash", n=1):
+    """Generate up to n completions (candidates) in a single Gemini API request."""
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
     headers = {"Content-Type": "application/json"}
-    data = json.dumps({
+    payload = {
         "contents": [{"parts": [{"text": prompt}]}],
         "generationConfig": {
-            "temperature": 1.0,
+            "temperature": TEMPERATURE,
             "maxOutputTokens": 400,
+            "candidateCount": n,
         },
-    }).encode()
+    }
 
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-    with urllib.request.urlopen(req, timeout=60) as resp:
-        result = json.loads(resp.read().decode())
-    candidates = result.get("candidates", [])
-    if candidates:
-        parts = candidates[0].get("content", {}).get("parts", [])
-        for part in parts:
-            if "text" in part:
-                return part["text"]
-    return ""
+    resp = await client.post(url, content=_encode(payload), headers=headers, timeout=60)
+    resp.raise_for_status()
+    result = _decode(resp)
+    candidates = result.get("candidates")
+    if not candidates:
+        # e.g. a blocked prompt; raise so the sample is retried, not cached
+        raise ValueError(f"Gemini returned no candidates: {result.get('promptFeedback', result)}")
+    texts = []
+    for candidate in candidates:
+        parts = candidate.get("content", {}).get("parts", [])
+        texts.append(next((part["text"] for part in parts if "text" in part), ""))
+    return texts
 
 
 # ============================================================================
 # ANALYSIS
 # ============================================================================
 
-def count_words_in_text(text, word_list):
-    """Count occurrences of any word in word_list within text."""
+# bytes.translate table keeping ASCII a-z and blanking every other byte, so
+# split() yields exactly the [a-z]+ runs (non-ASCII letters encode to '?')
+_TOKEN_TABLE = bytes(c if 97 <= c <= 122 else 32 for c in range(256))
+
+
+def tokenize(text):
+    """Lowercased [a-z]+ tokens of text, in order."""
+    return (text.lower().encode("ascii", "replace")
+            .translate(_TOKEN_TABLE).decode("ascii").split())
+
+
+def probe_word_sets(probe):
+    """(literary, equivalent) frozensets for a probe, precomputed for PROBES."""
+    sets = PROBE_WORD_SETS.get(probe["id"])
+    if sets is None:
+        sets = (frozenset(probe["literary_words"]),
+                frozenset(probe["equivalent_words"]))
+    return sets
+
+
+_AUTOMATA = {}  # probe id -> Aho-Corasick automaton over its word lists
+
+
+def _probe_automaton(probe):
+    """Build (once per probe) an automaton over its literary + equivalent words."""
+    automaton = _AUTOMATA.get(probe["id"])
+    if automaton is None:
+        literary_set, equivalent_set = probe_word_sets(probe)
+        automaton = ahocorasick.Automaton()
+        for w in literary_set | equivalent_set:
+            automaton.add_word(w, (w, w in literary_set, w in equivalent_set))
+        automaton.make_automaton()
+        _AUTOMATA[probe["id"]] = automaton
+    return automaton
+
+
+def match_probe_words(probe, text):
+    """
+    Literary and equivalent words in text, in order of appearance, from one
+    Aho-Corasick scan. A hit counts only as a whole [a-z]+ token, matching
+    tokenize().
+    """
     text_lower = text.lower()
-    words = re.findall(r'[a-z]+', text_lower)
-    count = 0
-    found = []
-    for w in words:
-        if w in word_list:
-            count += 1
-            found.append(w)
-    return count, found
+    last = len(text_lower) - 1
+    literary_found = []
+    equivalent_found = []
+    for end, (w, is_literary, is_equivalent) in _probe_automaton(probe).iter(text_lower):
+        start = end - len(w) + 1
+        if start > 0 and "a" <= text_lower[start - 1] <= "z":
+            continue
+        if end < last and "a" <= text_lower[end + 1] <= "z":
+            continue
+        if is_literary:
+            literary_found.append(w)
+        if is_equivalent:
+            equivalent_found.append(w)
+    return literary_found, equivalent_found
 
 
 def analyze_probe(probe, completions):
     """Analyze completions for a single probe."""
-    literary_set = set(probe["literary_words"])
-    equivalent_set = set(probe["equivalent_words"])
+    literary_set, equivalent_set = probe_word_sets(probe)
 
     literary_total = 0
     equivalent_total = 0
@@ -255,8 +418,13 @@ def analyze_probe(probe, completions):
     equivalent_found_all = Counter()
 
     for text in completions:
-        lit_count, lit_found = count_words_in_text(text, literary_set)
-        eq_count, eq_found = count_words_in_text(text, equivalent_set)
+        if ahocorasick is not None:
+            lit_found, eq_found = match_probe_words(probe, text)
+        else:
+            words = tokenize(text)
+            lit_found = [w for w in words if w in literary_set]
+            eq_found = [w for w in words if w in equivalent_set]
+        lit_count, eq_count = len(lit_found), len(eq_found)
 
         literary_total += lit_count
         equivalent_total += eq_count
@@ -273,10 +441,8 @@ def analyze_probe(probe, completions):
         if not has_lit and not has_eq:
             neither_passages += 1
 
-        for w in lit_found:
-            literary_found_all[w] += 1
-        for w in eq_found:
-            equivalent_found_all[w] += 1
+        literary_found_all.update(lit_found)
+        equivalent_found_all.update(eq_found)
 
     n = len(completions)
     return {
@@ -304,40 +470,326 @@ def analyze_probe(probe, completions):
 # ============================================================================
 
 MAX_CONSECUTIVE_FAILURES = 3  # circuit breaker: abort probe after N in a row
+# A tripped breaker whose failures all share one of these statuses marks the
+# model dead outright, without spending another preflight call on it
+DEAD_STATUS_CODES = {401, 403, 429, 500, 503}
 PREFLIGHT_PROMPT = "Write one sentence about a tree."
 
+# Completions requested per API call. Anthropic has no `n` parameter;
+# Gemini allows at most 8 candidates per request.
+MAX_BATCH = {
+    "anthropic_sonnet": 1,
+    "openai_gpt4o": N_SAMPLES,
+    "gemini_flash": 8,
+}
+
+# Per-model request budgets (requests per minute)
+REQUESTS_PER_MINUTE = {
+    "anthropic_sonnet": 50,
+    "openai_gpt4o": 3,
+    "gemini_flash": 15,
+}
+
+
+class TokenBucket:
+    """
+    Request pacer: a bucket of one token refilled every 60/rpm seconds.
+
+    acquire() only sleeps when the caller is ahead of quota, so time spent
+    waiting on a slow response counts towards the next request's spacing.
+    """
+
+    def __init__(self, rpm):
+        self.interval = 60.0 / rpm
+        self.next = 0.0
+
+    async def acquire(self):
+        now = time.monotonic()
+        wait = max(0.0, self.next - now)
+        self.next = max(now, self.next) + self.interval
+        await asyncio.sleep(wait)
+
 
-def preflight_check(caller, api_key, model_name, kwargs):
+async def preflight_check(client, caller, api_key, model_name, kwargs, bucket=None):
     """
     Fail-fast: make one test call before running the full experiment.
+    The call is not retried, so a dead key or model fails immediately.
     Returns (success: bool, message: str).
     """
-    print(f"  PREFLIGHT: Testing {model_name}...", end=" ", flush=True)
+    label = f"  PREFLIGHT: Testing {model_name}..."
     try:
-        text = caller(PREFLIGHT_PROMPT, api_key, **kwargs)
+        if bucket is not None:
+            await bucket.acquire()
+        text = (await caller(client, PREFLIGHT_PROMPT, api_key, **kwargs))[0]
         if text and len(text.strip()) > 5:
-            print(f"OK ({len(text)} chars)")
+            print(f"{label} OK ({len(text)} chars)")
             return True, "ok"
         else:
-            print(f"WARN: empty response")
+            print(f"{label} WARN: empty response")
             return False, "empty response from API"
     except Exception as e:
         err = str(e)[:120]
-        print(f"FAIL: {err}")
+        print(f"{label} FAIL: {err}")
         return False, err
 
 
-def save_incremental(all_results, model_filter):
-    """Save current state after every probe completion."""
-    suffix = f"_{model_filter}" if model_filter else ""
-    outfile = f"token_probing_results{suffix}.json"
+def error_signature(exc):
+    """(exception type, HTTP status or None) for circuit-breaker bookkeeping."""
+    response = getattr(exc, "response", None)
+    return type(exc).__name__, getattr(response, "status_code", None)
+
+
+async def sample_probe(client, caller, api_key, kwargs, prompt, bucket, batch=1, tag=""):
+    """
+    Draw N_SAMPLES completions for one prompt, up to `batch` per request.
+    Samples found in the completion cache are reused; the rest are requested
+    as fast as `bucket` allows. Until one request has succeeded they go one
+    at a time; after that they overlap while in flight. Once
+    MAX_CONSECUTIVE_FAILURES API calls (retries included) have failed in a
+    row, no new request is started or retried and any still in flight are
+    cancelled.
+
+    Progress lines are prefixed with `tag`. Returns (completions, failures,
+    error_streak): failures counts samples requested but not obtained, and
+    error_streak holds the error_signature() of each failed call since the
+    last full success.
+    """
+    model = kwargs["model"]
+    completions = []
+    missing = []
+    for i in range(N_SAMPLES):
+        text = cache_get(model, prompt, i)
+        if text is None:
+            missing.append(i)
+        else:
+            completions.append(text)
+    if completions:
+        print(f"    {tag}{len(completions)}/{N_SAMPLES} from cache")
+    failures = 0
+    error_streak = []
+    succeeded = False
+    in_flight = []
+
+    def tripped():
+        return len(error_streak) >= MAX_CONSECUTIVE_FAILURES
+
+    def record_failure(exc):
+        """Count one failed API call towards the breaker; cancel the rest if it trips."""
+        error_streak.append(error_signature(exc))
+        if tripped():
+            # Breaker open: stop the other requests instead of letting
+            # them fail (and retry) against a dead endpoint
+            for task in in_flight:
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+    async def one_request(indices):
+        nonlocal failures, succeeded
+
+        def on_retry(exc):
+            # Every failed call counts, retried or not, as each one costs quota
+            record_failure(exc)
+            print(f"    {tag}Sample {indices[0]+1} error [{len(error_streak)}/"
+                  f"{MAX_CONSECUTIVE_FAILURES}], retrying: {str(exc)[:80]}")
+
+        call = with_retry(caller, bucket, on_retry=on_retry, stop=tripped)
+        try:
+            texts = await call(client, prompt, api_key, n=len(indices), **kwargs)
+            if not texts:
+                raise ValueError(f"no completions returned for {len(indices)} requested")
+            before = len(completions)
+            for i, text in zip(indices, texts):
+                if text:  # an empty completion is used but not kept, so reruns retry it
+                    cache_put(model, prompt, i, text)
+                completions.append(text)
+            succeeded = True
+            # A batch can come back short; those samples stay unfilled, and
+            # the call counts as a failure for the breaker, not a success
+            short = len(indices) - len(texts)
+            if short > 0:
+                failures += short
+                record_failure(ValueError(f"got {len(texts)} of {len(indices)} completions"))
+                print(f"    {tag}Samples {indices[len(texts)]+1}-{indices[-1]+1} "
+                      f"FAIL [{len(error_streak)}/{MAX_CONSECUTIVE_FAILURES}]: "
+                      f"got {len(texts)} of {len(indices)} completions")
+            else:
+                error_streak.clear()  # reset on success
+            if len(completions) // 5 > before // 5:
+                print(f"    {tag}{len(completions)}/{N_SAMPLES} ok "
+                      f"({failures} failures so far)")
+        except RetryAborted as e:
+            # Already counted by on_retry; the breaker tripped meanwhile
+            failures += len(indices)
+            print(f"    {tag}Sample {indices[0]+1} ABANDONED (circuit breaker open): "
+                  f"{str(e)[:80]}")
+        except Exception as e:
+            failures += len(indices)
+            record_failure(e)
+            err = str(e)[:80]
+            print(f"    {tag}Sample {indices[0]+1} FAIL [{len(error_streak)}/"
+                  f"{MAX_CONSECUTIVE_FAILURES}]: {err}")
+
+    for start in range(0, len(missing), batch):
+        await bucket.acquire()
+        if tripped():
+            break
+        task = asyncio.create_task(one_request(missing[start:start + batch]))
+        in_flight.append(task)
+        if not succeeded:
+            # No request has worked yet: probe one at a time so a dead key
+            # costs at most MAX_CONSECUTIVE_FAILURES requests
+            await asyncio.gather(task, return_exceptions=True)
+    await asyncio.gather(*in_flight, return_exceptions=True)
+    return completions, failures, list(error_streak)
+
+
+# ============================================================================
+# COMPLETION CACHE
+# ============================================================================
+# Completions already paid for are kept on disk, so an interrupted run can be
+# restarted without re-sampling them. The key includes the sample index: at
+# temperature 1.0 we want N distinct samples per prompt, not N copies of one.
+
+CACHE_DIR = ".completion_cache"
+
+
+def _cache_path(model, prompt, sample_idx):
+    key = f"{model}|{prompt}|{TEMPERATURE}|{sample_idx}"
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode()).hexdigest() + ".txt")
+
+
+def cache_get(model, prompt, sample_idx):
+    """Cached completion text for this sample, or None."""
+    try:
+        with open(_cache_path(model, prompt, sample_idx), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def cache_put(model, prompt, sample_idx, text):
+    """Store a completion; written to a temp file first so entries are never partial."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(model, prompt, sample_idx)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(path + ".tmp", path)
+
+
+def _output_suffix(model_filter):
+    return f"_{model_filter}" if model_filter else ""
+
+
+def append_log(log, model_id, analysis):
+    """Checkpoint one probe analysis as a line of the run's JSONL log."""
+    log.write(json.dumps({"model": model_id, "probe": analysis}, default=str) + "\n")
+    log.flush()
+
+
+def save_results(all_results, model_filter):
+    """Write the full results snapshot (once, at the end of a run)."""
+    outfile = f"token_probing_results{_output_suffix(model_filter)}.json"
     with open(outfile, "w") as f:
         json.dump(all_results, f, indent=2, default=str)
     return outfile
 
 
 def run_probing(model_filter=None):
-    """Run probing with fail-fast, circuit breakers, and incremental saves."""
+    """
+    Run probing with fail-fast and circuit breakers. Each probe analysis is
+    appended to token_probing_log[_<model>].jsonl as it completes; the full
+    results file is written when the run ends.
+    """
+    return asyncio.run(_run_probing(model_filter))
+
+
+async def run_model(client, model, bucket, log, logfile):
+    """Run every probe against one model; returns its results dict."""
+    model_id, model_name, caller, api_key, kwargs = model
+    tag = f"[{model_id}] "
+    print(f"\n  {tag}MODEL: {model_name}")
+
+    model_results = {
+        "model": model_name,
+        "model_id": model_id,
+        "probes": [],
+        # Running sums for the summary, updated as each probe is analyzed
+        "totals": {
+            "n_probes": 0,
+            "literary_rate_sum": 0.0,
+            "equivalent_rate_sum": 0.0,
+            "literary_occurrences": 0,
+            "equivalent_occurrences": 0,
+        },
+    }
+    model_dead = False
+
+    for probe in PROBES:
+        if model_dead:
+            print(f"\n  {tag}Probe {probe['id']} — SKIPPED (model circuit-breaker tripped)")
+            continue
+
+        print(f"\n  {tag}Probe {probe['id']} ({probe['register']})...")
+        completions, failures, error_streak = await sample_probe(
+            client, caller, api_key, kwargs, probe["context"],
+            bucket, MAX_BATCH[model_id], tag)
+        tripped = len(error_streak) >= MAX_CONSECUTIVE_FAILURES
+
+        # ── Circuit breaker: N consecutive failures = abort probe ──
+        if tripped:
+            print(f"    {tag}CIRCUIT BREAKER: {len(error_streak)} consecutive "
+                  f"failures. Aborting probe.")
+            signatures = set(error_streak)
+            status = error_streak[0][1]
+            if len(signatures) == 1 and status in DEAD_STATUS_CODES:
+                # Same hard error every time: the model is down, no need to re-check
+                print(f"    {tag}MODEL DEAD: HTTP {status} on every attempt. "
+                      f"Skipping remaining probes.")
+                model_dead = True
+            else:
+                # Mixed or transient errors: check if the model is dead entirely
+                print(f"    {tag}RE-CHECKING model health...")
+                ok, msg = await preflight_check(client, caller, api_key, model_name,
+                                                kwargs, bucket)
+                if not ok:
+                    print(f"    {tag}MODEL DEAD: {msg}. Skipping remaining probes.")
+                    model_dead = True
+
+        # ── Analyze whatever we got ──
+        if completions:
+            analysis = analyze_probe(probe, completions)
+            analysis["failures"] = failures
+            analysis["circuit_breaker_tripped"] = tripped
+            model_results["probes"].append(analysis)
+            totals = model_results["totals"]
+            totals["n_probes"] += 1
+            totals["literary_rate_sum"] += analysis["literary_rate"]
+            totals["equivalent_rate_sum"] += analysis["equivalent_rate"]
+            totals["literary_occurrences"] += analysis["literary_total_occurrences"]
+            totals["equivalent_occurrences"] += analysis["equivalent_total_occurrences"]
+            # No await between here and the write, so concurrent models
+            # never interleave partial lines in the log
+            append_log(log, model_id, analysis)
+
+            lit_r = analysis["literary_rate"]
+            eq_r = analysis["equivalent_rate"]
+            pref = analysis["preference_ratio"]
+            print(f"    {tag}{probe['id']} Literary: "
+                  f"{analysis['literary_passages']}/{len(completions)} "
+                  f"({lit_r:.0%})  |  Equivalent: "
+                  f"{analysis['equivalent_passages']}/{len(completions)} "
+                  f"({eq_r:.0%})  |  Pref ratio: {pref:.2f}")
+            if analysis["literary_words_found"]:
+                top_lit = list(analysis["literary_words_found"].items())[:5]
+                print(f"    {tag}Top literary: {top_lit}")
+            print(f"    {tag}[logged → {logfile}]")
+        else:
+            print(f"    {tag}{probe['id']} FAILED: no completions generated")
+
+    return model_results
+
+
+async def _run_probing(model_filter):
     ANTHROPIC_KEY = os.environ["ANTHROPIC_API_KEY"]
     OPENAI_KEY = os.environ["OPENAI_API_KEY"]
     GEMINI_KEY = os.environ["GEMINI_API_KEY"]
@@ -354,111 +806,39 @@ def run_probing(model_filter=None):
     if model_filter:
         models = [m for m in models if m[0] == model_filter]
 
-    # ── PREFLIGHT: test every model before doing real work ──
-    print(f"\n{'=' * 72}")
-    print("  PREFLIGHT CHECKS")
-    print(f"{'=' * 72}")
-    live_models = []
-    for model_id, model_name, caller, api_key, kwargs in models:
-        ok, msg = preflight_check(caller, api_key, model_name, kwargs)
-        if ok:
-            live_models.append((model_id, model_name, caller, api_key, kwargs))
-        else:
-            print(f"  SKIPPING {model_name}: {msg}")
-
-    if not live_models:
-        print("\n  ALL MODELS FAILED PREFLIGHT. Aborting.")
-        return {}
-
-    print(f"\n  {len(live_models)}/{len(models)} models passed preflight.\n")
-
-    # ── MAIN LOOP ──
-    all_results = {}
-
-    for model_id, model_name, caller, api_key, kwargs in live_models:
+    # One client for the whole run, shared by every request
+    logfile = f"token_probing_log{_output_suffix(model_filter)}.jsonl"
+    async with make_client() as client:
+        # ── PREFLIGHT: test every model before doing real work ──
         print(f"\n{'=' * 72}")
-        print(f"  MODEL: {model_name}")
+        print("  PREFLIGHT CHECKS")
         print(f"{'=' * 72}")
-
-        model_results = {
-            "model": model_name,
-            "model_id": model_id,
-            "probes": [],
-        }
-        model_dead = False
-
-        for probe in PROBES:
-            if model_dead:
-                print(f"\n  Probe {probe['id']} — SKIPPED (model circuit-breaker tripped)")
-                continue
-
-            print(f"\n  Probe {probe['id']} ({probe['register']})...")
-            completions = []
-            failures = 0
-            consecutive_failures = 0
-
-            for i in range(N_SAMPLES):
-                # ── Circuit breaker: N consecutive failures = abort probe ──
-                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                    print(f"    CIRCUIT BREAKER: {consecutive_failures} consecutive "
-                          f"failures. Aborting probe.")
-                    # Check if the model is dead entirely
-                    print(f"    RE-CHECKING model health...", end=" ", flush=True)
-                    ok, msg = preflight_check(caller, api_key, model_name, kwargs)
-                    if not ok:
-                        print(f"    MODEL DEAD: {msg}. Skipping remaining probes.")
-                        model_dead = True
-                    break
-
-                try:
-                    text = caller(probe["context"], api_key, **kwargs)
-                    completions.append(text)
-                    consecutive_failures = 0  # reset on success
-                    if (i + 1) % 5 == 0:
-                        print(f"    {i+1}/{N_SAMPLES} ok "
-                              f"({failures} failures so far)")
-                except Exception as e:
-                    failures += 1
-                    consecutive_failures += 1
-                    err = str(e)[:80]
-                    print(f"    Sample {i+1} FAIL [{consecutive_failures}/"
-                          f"{MAX_CONSECUTIVE_FAILURES}]: {err}")
-
-                # Rate limiting
-                if model_id == "openai_gpt4o":
-                    time.sleep(22)  # 3 RPM limit
-                elif model_id == "gemini_flash":
-                    time.sleep(4)
-                else:
-                    time.sleep(1)
-
-            # ── Analyze whatever we got ──
-            if completions:
-                analysis = analyze_probe(probe, completions)
-                analysis["failures"] = failures
-                analysis["circuit_breaker_tripped"] = (
-                    consecutive_failures >= MAX_CONSECUTIVE_FAILURES)
-                model_results["probes"].append(analysis)
-
-                lit_r = analysis["literary_rate"]
-                eq_r = analysis["equivalent_rate"]
-                pref = analysis["preference_ratio"]
-                print(f"    Literary: {analysis['literary_passages']}/{len(completions)} "
-                      f"({lit_r:.0%})  |  Equivalent: "
-                      f"{analysis['equivalent_passages']}/{len(completions)} "
-                      f"({eq_r:.0%})  |  Pref ratio: {pref:.2f}")
-                if analysis["literary_words_found"]:
-                    top_lit = list(analysis["literary_words_found"].items())[:5]
-                    print(f"    Top literary: {top_lit}")
+        buckets = {m[0]: TokenBucket(REQUESTS_PER_MINUTE[m[0]]) for m in models}
+        checks = await asyncio.gather(*(
+            preflight_check(client, caller, api_key, model_name, kwargs, buckets[model_id])
+            for model_id, model_name, caller, api_key, kwargs in models))
+        live_models = []
+        for model, (ok, msg) in zip(models, checks):
+            if ok:
+                live_models.append(model)
             else:
-                print(f"    FAILED: no completions generated")
+                print(f"  SKIPPING {model[1]}: {msg}")
 
-            # ── Incremental save after every probe ──
-            all_results[model_id] = model_results
-            outfile = save_incremental(all_results, model_filter)
-            print(f"    [saved → {outfile}]")
+        if not live_models:
+            print("\n  ALL MODELS FAILED PREFLIGHT. Aborting.")
+            return {}
 
-        all_results[model_id] = model_results
+        print(f"\n  {len(live_models)}/{len(models)} models passed preflight.\n")
+
+        # ── MAIN LOOP: models are independent endpoints, so run them together ──
+        print(f"{'=' * 72}")
+        print(f"  PROBING: {', '.join(m[1] for m in live_models)}")
+        print(f"{'=' * 72}")
+        with open(logfile, "a") as log:
+            model_results = await asyncio.gather(*(
+                run_model(client, model, buckets[model[0]], log, logfile)
+                for model in live_models))
+        all_results = {model[0]: mr for model, mr in zip(live_models, model_results)}
 
     # ================================================================
     # SUMMARY
@@ -482,15 +862,12 @@ def run_probing(model_filter=None):
     # Aggregate across probes per model
     print(f"\n  Aggregate (mean across probes):")
     for model_id, mr in all_results.items():
-        if mr["probes"]:
-            mean_lit = (sum(p["literary_rate"] for p in mr["probes"])
-                       / len(mr["probes"]))
-            mean_eq = (sum(p["equivalent_rate"] for p in mr["probes"])
-                      / len(mr["probes"]))
-            total_lit = sum(p["literary_total_occurrences"]
-                          for p in mr["probes"])
-            total_eq = sum(p["equivalent_total_occurrences"]
-                         for p in mr["probes"])
+        totals = mr["totals"]
+        if totals["n_probes"]:
+            mean_lit = totals["literary_rate_sum"] / totals["n_probes"]
+            mean_eq = totals["equivalent_rate_sum"] / totals["n_probes"]
+            total_lit = totals["literary_occurrences"]
+            total_eq = totals["equivalent_occurrences"]
             overall_pref = (total_lit / total_eq
                           if total_eq > 0 else float('inf'))
             print(f"    {mr['model']:<20} literary={mean_lit:.0%}  "
@@ -498,8 +875,13 @@ def run_probing(model_filter=None):
                   f"overall pref={overall_pref:.2f}  "
                   f"(total: {total_lit} lit / {total_eq} eq)")
 
+    if ANTHROPIC_USAGE:
+        print(f"\n  Anthropic input tokens: {ANTHROPIC_USAGE['input_tokens']} uncached, "
+              f"{ANTHROPIC_USAGE['cache_read_input_tokens']} cache reads, "
+              f"{ANTHROPIC_USAGE['cache_creation_input_tokens']} cache writes")
+
     # Final save
-    outfile = save_incremental(all_results, model_filter)
+    outfile = save_results(all_results, model_filter)
     print(f"\n  Final results saved to {outfile}")
 
     return all_results
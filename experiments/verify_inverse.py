@@ -8,340 +8,438 @@ and compares against reported values. Any discrepancy > tolerance is flagged.
 This addresses the request: "perform inverse operations on the mathematical
 operations you have performed to ensure that results were calculated correctly
 and not imagined."
+
+Only mismatches and the summary are printed; set VERIFY_VERBOSE=1 to also
+print every passing check.
 """
 
+import contextlib
+import functools
+import io
 import math
 import json
+import os
 import sys
+from operator import itemgetter
+from typing import NamedTuple
+
+try:
+    import orjson
+except ImportError:  # optional: the ablation results are read with stdlib json instead
+    orjson = None
 
 sys.path.insert(0, "/sessions/wizardly-optimistic-bohr")
 from statistical_tests import (
-    fishers_exact_test, fishers_exact_two_sided,
+    fishers_exact_test, fishers_exact_test_batch, fishers_exact_two_sided,
     cohens_h, binomial_ci_clopper_pearson
 )
 
 TOLERANCE = 0.015  # Allow rounding tolerance for p-values and h
 ERRORS = []
 CHECKS = 0
+VERBOSE = bool(os.environ.get("VERIFY_VERBOSE"))  # also print passing checks
+
+class AblationConfig(NamedTuple):
+    """One row of the paper's ablation table (Appendix E.7)."""
+    label: str
+    key: str  # config key in ablation_results.json
+    h_flagged: int
+    h_total: int
+    l_flagged: int
+    l_total: int
+    reported_h: float
+    reported_p: float
+
+ablation_configs = [
+    AblationConfig("Full model", "full", 1, 25, 27, 100, 0.690, 0.008),
+    AblationConfig("No isolation", "no_isolation", 1, 25, 33, 100, 0.821, 0.002),
+    AblationConfig("No chain", "no_chain", 1, 25, 21, 100, 0.549, 0.035),
+    AblationConfig("No preparation", "no_preparation", 2, 25, 26, 100, 0.497, 0.041),
+]
 
-def check(label, computed, reported, tol=TOLERANCE):
+@functools.lru_cache(maxsize=None)
+def _fet_cached(a, b, c, d):
+    """fishers_exact_test, computed once per distinct (a, b, c, d) table."""
+    return fishers_exact_test(a, b, c, d)
+
+def ablation_statistics(configs):
+    """
+    Cohen's h and one-sided Fisher p for each ablation config.
+
+    Pure computation, no reporting: returns two dicts keyed by config key.
+    The Fisher p-values come from one fishers_exact_test_batch call, which
+    reads them from per-margin hypergeometric tail tables.
+    """
+    keys = [c.key for c in configs]
+    hs = [cohens_h(c.l_flagged / c.l_total, c.h_flagged / c.h_total) for c in configs]
+    ps = fishers_exact_test_batch([
+        (c.l_flagged, c.l_total - c.l_flagged, c.h_flagged, c.h_total - c.h_flagged)
+        for c in configs
+    ])
+    return dict(zip(keys, hs)), dict(zip(keys, ps))
+
+def check(label, computed, reported, tol=TOLERANCE, verbose=None):
     global CHECKS, ERRORS
     CHECKS += 1
     diff = abs(computed - reported)
-    status = "OK" if diff <= tol else "MISMATCH"
-    if status == "MISMATCH":
+    if diff <= tol:
+        if not (VERBOSE if verbose is None else verbose):
+            return
+        status = "OK"
+    else:
+        status = "MISMATCH"
         ERRORS.append(f"  {label}: computed={computed:.6f}, reported={reported:.6f}, diff={diff:.6f}")
     print(f"  [{status}] {label}: computed={computed:.6f}, reported={reported:.6f}" +
           (f"  (diff={diff:.6f})" if diff > 0.0005 else ""))
 
-def check_rate(label, num, denom, reported_pct):
+def check_rate(label, num, denom, reported_pct, verbose=None):
     """Verify a simple percentage: num/denom = reported%."""
-    global CHECKS, ERRORS
-    CHECKS += 1
-    computed = num / denom * 100
-    diff = abs(computed - reported_pct)
-    status = "OK" if diff < 0.15 else "MISMATCH"
-    if status == "MISMATCH":
-        ERRORS.append(f"  {label}: {num}/{denom} = {computed:.1f}%, reported {reported_pct:.1f}%")
-    print(f"  [{status}] {label}: {num}/{denom} = {computed:.1f}%, reported {reported_pct:.1f}%")
-
-# ============================================================================
-print("=" * 72)
-print("INVERSE VERIFICATION: All Paper Statistics")
-print("=" * 72)
-
-# ============================================================================
-# 1. APPENDIX E.1: Primary Analysis v2
-# ============================================================================
-print("\n[1] Appendix E.1 — Primary Analysis v2 (Exp 8c)")
-print("-" * 60)
-# Contingency: LLM 9 flagged, 11 clean (n=20); Human 1 flagged, 24 clean (n=25)
-a, b, c, d = 9, 11, 1, 24
-
-# Verify rates
-check_rate("LLM v2 flag rate", 9, 20, 45.0)
-check_rate("Human flag rate", 1, 25, 4.0)
-
-# Fisher's
-p1 = fishers_exact_test(a, b, c, d)
-p2 = fishers_exact_two_sided(a, b, c, d)
-check("Fisher one-sided (v2)", p1, 0.0014)
-check("Fisher two-sided (v2)", p2, 0.0024)
-
-# Cohen's h — paper reports h=1.69; the rate used is passage-level flag rate
-# But wait — paper E.1 says LLM rate 0.750 — that's 15/20 for LSR word count,
-# not 9/20 passage flag rate. Let me check what the paper actually uses.
-# Paper E.1: "LLM rate: 0.750, 95% CI [0.509, 0.913]" — that's 15/20
-# So the Cohen's h is computed on the WORD-LEVEL rate (15/20 vs 1/25)?
-# Or the passage-level? Let me verify: h = 2*arcsin(sqrt(0.750)) - 2*arcsin(sqrt(0.04))
-h_word = cohens_h(15/20, 1/25)
-h_passage = cohens_h(9/20, 1/25)
-print(f"\n  Note: paper reports h=1.69 and LLM rate=0.750")
-print(f"  Cohen's h from word rate (15/20 vs 1/25) = {h_word:.3f}")
-print(f"  Cohen's h from passage rate (9/20 vs 1/25) = {h_passage:.3f}")
-check("Cohen's h (v2, word rate)", h_word, 1.69)
-
-# CIs
-ci_llm = binomial_ci_clopper_pearson(15, 20)
-ci_hum = binomial_ci_clopper_pearson(1, 25)
-check("LLM CI lower (v2)", ci_llm[0], 0.509)
-check("LLM CI upper (v2)", ci_llm[1], 0.913)
-check("Human CI lower", ci_hum[0], 0.001)
-check("Human CI upper", ci_hum[1], 0.204)
-
-# ============================================================================
-# 2. APPENDIX E.2: Primary Analysis v3
-# ============================================================================
-print("\n[2] Appendix E.2 — Primary Analysis v3 (Exp 8c)")
-print("-" * 60)
-a, b, c, d = 7, 13, 1, 24
-
-p1 = fishers_exact_test(a, b, c, d)
-p2 = fishers_exact_two_sided(a, b, c, d)
-check("Fisher one-sided (v3)", p1, 0.0096)
-check("Fisher two-sided (v3)", p2, 0.0146)
-
-h = cohens_h(7/20, 1/25)
-check("Cohen's h (v3)", h, 0.86)
-
-check_rate("LLM v3 passage flag rate", 7, 20, 35.0)
-
-# ============================================================================
-# 3. APPENDIX E.3: GPT-4o
-# ============================================================================
-print("\n[3] Appendix E.3 — GPT-4o Cross-Family")
-print("-" * 60)
-a, b, c, d = 3, 17, 1, 24
-
-p1 = fishers_exact_test(a, b, c, d)
-p2 = fishers_exact_two_sided(a, b, c, d)
-check("Fisher one-sided (GPT-4o)", p1, 0.224)
-check("Fisher two-sided (GPT-4o)", p2, 0.309)
-
-h = cohens_h(3/20, 1/25)
-check("Cohen's h (GPT-4o)", h, 0.39)
-
-check_rate("GPT-4o flag rate", 3, 20, 15.0)
-ci = binomial_ci_clopper_pearson(3, 20)
-check("GPT-4o CI lower", ci[0], 0.032)
-check("GPT-4o CI upper", ci[1], 0.379)
-
-# ============================================================================
-# 4. APPENDIX E.4: Gemini
-# ============================================================================
-print("\n[4] Appendix E.4 — Gemini 2.5 Flash")
-print("-" * 60)
-a, b, c, d = 8, 12, 1, 24
-
-p1 = fishers_exact_test(a, b, c, d)
-p2 = fishers_exact_two_sided(a, b, c, d)
-check("Fisher one-sided (Gemini)", p1, 0.004)
-check("Fisher two-sided (Gemini)", p2, 0.006)
-
-h = cohens_h(8/20, 1/25)
-check("Cohen's h (Gemini)", h, 0.97)
-
-check_rate("Gemini flag rate", 8, 20, 40.0)
-ci = binomial_ci_clopper_pearson(8, 20)
-check("Gemini CI lower", ci[0], 0.191)
-check("Gemini CI upper", ci[1], 0.639)
-
-# ============================================================================
-# 5. APPENDIX E.5: Three-Family Pooled
-# ============================================================================
-print("\n[5] Appendix E.5 — Three-Family Pooled")
-print("-" * 60)
-a, b, c, d = 28, 72, 1, 24
-
-p1 = fishers_exact_test(a, b, c, d)
-p2 = fishers_exact_two_sided(a, b, c, d)
-check("Fisher one-sided (pooled)", p1, 0.006)
-check("Fisher two-sided (pooled)", p2, 0.010)
-
-h = cohens_h(28/100, 1/25)
-check("Cohen's h (pooled)", h, 0.71)
-
-check_rate("Pooled LLM flag rate", 28, 100, 28.0)
-ci = binomial_ci_clopper_pearson(28, 100)
-check("Pooled LLM CI lower", ci[0], 0.195)
-check("Pooled LLM CI upper", ci[1], 0.379)
-
-# ============================================================================
-# 6. APPENDIX E.6: Per-Model Breakdown
-# ============================================================================
-print("\n[6] Appendix E.6 — Per-Model Breakdown")
-print("-" * 60)
-# Each model vs human (1/25)
-models = [
-    ("Gemini 2.5 Flash", 8, 20, 40.0, 0.97, 0.004),
-    ("Sonnet (Exp 8c)", 7, 20, 35.0, 0.86, 0.010),
-    ("Haiku 3.5", 7, 20, 35.0, 0.86, 0.010),
-    ("GPT-4o", 3, 20, 15.0, 0.39, 0.224),
-    ("Sonnet (replication)", 3, 20, 15.0, 0.39, 0.224),
-]
-
-for name, flagged, n, rate_pct, reported_h, reported_p in models:
-    print(f"\n  --- {name} ---")
-    check_rate(f"{name} rate", flagged, n, rate_pct)
+    check_rates([(label, num, denom, reported_pct)], verbose=verbose)
 
-    h = cohens_h(flagged/n, 1/25)
-    check(f"{name} Cohen's h", h, reported_h)
+def check_rates(rows, verbose=None):
+    """
+    Verify a batch of (label, num, denom, reported_pct) percentages.
 
-    a, b, c, d = flagged, n - flagged, 1, 24
-    p = fishers_exact_test(a, b, c, d)
-    check(f"{name} Fisher p (1-sided)", p, reported_p)
-
-# Verify pooled sum
-total_flagged = sum(m[1] for m in models)
-total_n = sum(m[2] for m in models)
-print(f"\n  Pooled sum check: {total_flagged} flagged / {total_n} total")
-check_rate("Pooled sum", total_flagged, total_n, 28.0)
-
-# ============================================================================
-# 7. APPENDIX E.7: Ablation Study
-# ============================================================================
-print("\n[7] Appendix E.7 — Ablation Study")
-print("-" * 60)
-
-# Load ablation results
-with open("/sessions/wizardly-optimistic-bohr/ablation_results.json") as f:
-    ablation = json.load(f)
-
-ablation_configs = [
-    ("Full model", "full", 1, 25, 27, 100, 0.690, 0.008),
-    ("No isolation", "no_isolation", 1, 25, 33, 100, 0.821, 0.002),
-    ("No chain", "no_chain", 1, 25, 21, 100, 0.549, 0.035),
-    ("No preparation", "no_preparation", 2, 25, 26, 100, 0.497, 0.041),
-]
-
-for label, key, h_flagged, h_total, l_flagged, l_total, reported_h, reported_p in ablation_configs:
-    print(f"\n  --- {label} ---")
-
-    # Verify data file matches paper
-    data = ablation[key]
-    check(f"{label} human_flagged (data)", float(data["human_flagged"]), float(h_flagged), tol=0.5)
-    check(f"{label} llm_flagged (data)", float(data["llm_flagged"]), float(l_flagged), tol=0.5)
-    check(f"{label} human_total (data)", float(data["human_total"]), float(h_total), tol=0.5)
-    check(f"{label} llm_total (data)", float(data["llm_total"]), float(l_total), tol=0.5)
+    All rates are computed in one pass before reporting; a zero denominator
+    gives a NaN rate and is reported as a mismatch rather than raising.
+    """
+    global CHECKS, ERRORS
+    CHECKS += len(rows)
+    if verbose is None:
+        verbose = VERBOSE
+    rates = [num / denom * 100 if denom else math.nan for _, num, denom, _ in rows]
+    for (label, num, denom, reported_pct), computed in zip(rows, rates):
+        diff = abs(computed - reported_pct)
+        status = "OK" if diff < 0.15 else "MISMATCH"
+        if status == "MISMATCH":
+            ERRORS.append(f"  {label}: {num}/{denom} = {computed:.1f}%, reported {reported_pct:.1f}%")
+        elif not verbose:
+            continue
+        print(f"  [{status}] {label}: {num}/{denom} = {computed:.1f}%, reported {reported_pct:.1f}%")
+
+def main():
+    global CHECKS
+
+    # ============================================================================
+    print("=" * 72)
+    print("INVERSE VERIFICATION: All Paper Statistics")
+    print("=" * 72)
+
+    # ============================================================================
+    # 1. APPENDIX E.1: Primary Analysis v2
+    # ============================================================================
+    print("\n[1] Appendix E.1 — Primary Analysis v2 (Exp 8c)")
+    print("-" * 60)
+    # Contingency: LLM 9 flagged, 11 clean (n=20); Human 1 flagged, 24 clean (n=25)
+    a, b, c, d = 9, 11, 1, 24
 
     # Verify rates
-    check_rate(f"{label} human rate", h_flagged, h_total, data["human_rate"] * 100)
-    check_rate(f"{label} LLM rate", l_flagged, l_total, data["llm_rate"] * 100)
-
-    # Recompute Cohen's h
-    h = cohens_h(l_flagged / l_total, h_flagged / h_total)
-    check(f"{label} Cohen's h (recomputed)", h, reported_h)
-    check(f"{label} Cohen's h (vs data file)", h, data["cohens_h"])
-
-    # Recompute Fisher's
-    a = l_flagged
-    b = l_total - l_flagged
-    c = h_flagged
-    d = h_total - h_flagged
-    p = fishers_exact_test(a, b, c, d)
-    check(f"{label} Fisher p 1-sided (recomputed)", p, reported_p)
-    check(f"{label} Fisher p 1-sided (vs data file)", p, data["fisher_one_sided_p"])
-
-    # Verify per-model sums add up
-    per_model = data["per_model"]
-    sum_flagged = sum(v["flagged"] for k, v in per_model.items())
-    sum_n = sum(v["n"] for k, v in per_model.items())
-    human_keys = [k for k in per_model if k.startswith("human")]
-    llm_keys = [k for k in per_model if not k.startswith("human")]
-    sum_human_flagged = sum(per_model[k]["flagged"] for k in human_keys)
-    sum_human_n = sum(per_model[k]["n"] for k in human_keys)
-    sum_llm_flagged = sum(per_model[k]["flagged"] for k in llm_keys)
-    sum_llm_n = sum(per_model[k]["n"] for k in llm_keys)
-
-    check(f"{label} per-model human flagged sum", float(sum_human_flagged), float(h_flagged), tol=0.5)
-    check(f"{label} per-model LLM flagged sum", float(sum_llm_flagged), float(l_flagged), tol=0.5)
-    check(f"{label} per-model human n sum", float(sum_human_n), float(h_total), tol=0.5)
-    check(f"{label} per-model LLM n sum", float(sum_llm_n), float(l_total), tol=0.5)
-
-# ============================================================================
-# 8. Verify Δh values in ablation table
-# ============================================================================
-print("\n[8] Ablation Δh values")
-print("-" * 60)
-
-full_h = cohens_h(27/100, 1/25)
-no_iso_h = cohens_h(33/100, 1/25)
-no_chain_h = cohens_h(21/100, 1/25)
-no_prep_h = cohens_h(26/100, 2/25)
-
-delta_no_iso = no_iso_h - full_h
-delta_no_chain = no_chain_h - full_h
-delta_no_prep = no_prep_h - full_h
-
-check("Δh no_isolation", delta_no_iso, 0.131)
-check("Δh no_chain", delta_no_chain, -0.141)
-check("Δh no_preparation", delta_no_prep, -0.193)
-
-# ============================================================================
-# 9. Verify abstract claims
-# ============================================================================
-print("\n[9] Abstract Claims")
-print("-" * 60)
-print("  Abstract: 'p = 0.001, Cohen's h = 1.69' — v2 primary result")
-check("Abstract p (v2 primary)", fishers_exact_test(9, 11, 1, 24), 0.001, tol=0.001)
-check("Abstract h (v2 primary)", cohens_h(15/20, 1/25), 1.69)
-
-print("  Abstract: '28.0% true positive rate...4% false positive rate'")
-check_rate("Abstract TPR", 28, 100, 28.0)
-check_rate("Abstract FPR", 1, 25, 4.0)
-
-print("  Abstract: 'Fisher's p = 0.006, Cohen's h = 0.71'")
-check("Abstract pooled p", fishers_exact_test(28, 72, 1, 24), 0.006)
-check("Abstract pooled h", cohens_h(28/100, 1/25), 0.71)
-
-print("  Abstract: 'Gemini...40%, p = 0.004...Cohen's h = 0.97'")
-check_rate("Abstract Gemini rate", 8, 20, 40.0)
-check("Abstract Gemini p", fishers_exact_test(8, 12, 1, 24), 0.004)
-check("Abstract Gemini h", cohens_h(8/20, 1/25), 0.97)
-
-# ============================================================================
-# 10. Cross-check: ablation per-model vs paper table
-# ============================================================================
-print("\n[10] Ablation Per-Model Table vs Paper")
-print("-" * 60)
-# Paper reports (Section E.7 per-model breakdown):
-# Model          | Full | No iso | No chain | No prep
-# Richard (n=5)  | 0/5  | 0/5    | 0/5      | 0/5
-# Published(n=20)| 1/20 | 1/20   | 1/20     | 2/20
-# Sonnet orig    | 6/20 | 7/20   | 5/20     | 4/20
-# Haiku          | 7/20 | 9/20   | 4/20     | 5/20
-# Sonnet rep     | 3/20 | 4/20   | 3/20     | 5/20
-# GPT-4o         | 3/20 | 4/20   | 3/20     | 4/20
-# Gemini         | 8/20 | 9/20   | 6/20     | 8/20
-
-paper_per_model = {
-    "full": {"human_richard": 0, "human_published": 1, "sonnet_original": 6, "haiku": 7, "sonnet_replication": 3, "gpt4o": 3, "gemini": 8},
-    "no_isolation": {"human_richard": 0, "human_published": 1, "sonnet_original": 7, "haiku": 9, "sonnet_replication": 4, "gpt4o": 4, "gemini": 9},
-    "no_chain": {"human_richard": 0, "human_published": 1, "sonnet_original": 5, "haiku": 4, "sonnet_replication": 3, "gpt4o": 3, "gemini": 6},
-    "no_preparation": {"human_richard": 0, "human_published": 2, "sonnet_original": 4, "haiku": 5, "sonnet_replication": 5, "gpt4o": 4, "gemini": 8},
-}
-
-for config_key, paper_vals in paper_per_model.items():
-    data_vals = ablation[config_key]["per_model"]
-    for model, paper_flagged in paper_vals.items():
-        data_flagged = data_vals[model]["flagged"]
+    check_rates([
+        ("LLM v2 flag rate", 9, 20, 45.0),
+        ("Human flag rate", 1, 25, 4.0),
+    ])
+
+    # Fisher's
+    p1 = fishers_exact_test(a, b, c, d)
+    p2 = fishers_exact_two_sided(a, b, c, d)
+    check("Fisher one-sided (v2)", p1, 0.0014)
+    check("Fisher two-sided (v2)", p2, 0.0024)
+
+    # Cohen's h — paper reports h=1.69; the rate used is passage-level flag rate
+    # But wait — paper E.1 says LLM rate 0.750 — that's 15/20 for LSR word count,
+    # not 9/20 passage flag rate. Let me check what the paper actually uses.
+    # Paper E.1: "LLM rate: 0.750, 95% CI [0.509, 0.913]" — that's 15/20
+    # So the Cohen's h is computed on the WORD-LEVEL rate (15/20 vs 1/25)?
+    # Or the passage-level? Let me verify: h = 2*arcsin(sqrt(0.750)) - 2*arcsin(sqrt(0.04))
+    h_word = cohens_h(15/20, 1/25)
+    h_passage = cohens_h(9/20, 1/25)
+    print(f"\n  Note: paper reports h=1.69 and LLM rate=0.750")
+    print(f"  Cohen's h from word rate (15/20 vs 1/25) = {h_word:.3f}")
+    print(f"  Cohen's h from passage rate (9/20 vs 1/25) = {h_passage:.3f}")
+    check("Cohen's h (v2, word rate)", h_word, 1.69)
+
+    # CIs
+    ci_llm = binomial_ci_clopper_pearson(15, 20)
+    ci_hum = binomial_ci_clopper_pearson(1, 25)
+    check("LLM CI lower (v2)", ci_llm[0], 0.509)
+    check("LLM CI upper (v2)", ci_llm[1], 0.913)
+    check("Human CI lower", ci_hum[0], 0.001)
+    check("Human CI upper", ci_hum[1], 0.204)
+
+    # ============================================================================
+    # 2. APPENDIX E.2: Primary Analysis v3
+    # ============================================================================
+    print("\n[2] Appendix E.2 — Primary Analysis v3 (Exp 8c)")
+    print("-" * 60)
+    a, b, c, d = 7, 13, 1, 24
+
+    p1 = fishers_exact_test(a, b, c, d)
+    p2 = fishers_exact_two_sided(a, b, c, d)
+    check("Fisher one-sided (v3)", p1, 0.0096)
+    check("Fisher two-sided (v3)", p2, 0.0146)
+
+    h = cohens_h(7/20, 1/25)
+    check("Cohen's h (v3)", h, 0.86)
+
+    check_rate("LLM v3 passage flag rate", 7, 20, 35.0)
+
+    # ============================================================================
+    # 3. APPENDIX E.3: GPT-4o
+    # ============================================================================
+    print("\n[3] Appendix E.3 — GPT-4o Cross-Family")
+    print("-" * 60)
+    a, b, c, d = 3, 17, 1, 24
+
+    p1 = fishers_exact_test(a, b, c, d)
+    p2 = fishers_exact_two_sided(a, b, c, d)
+    check("Fisher one-sided (GPT-4o)", p1, 0.224)
+    check("Fisher two-sided (GPT-4o)", p2, 0.309)
+
+    h = cohens_h(3/20, 1/25)
+    check("Cohen's h (GPT-4o)", h, 0.39)
+
+    check_rate("GPT-4o flag rate", 3, 20, 15.0)
+    ci = binomial_ci_clopper_pearson(3, 20)
+    check("GPT-4o CI lower", ci[0], 0.032)
+    check("GPT-4o CI upper", ci[1], 0.379)
+
+    # ============================================================================
+    # 4. APPENDIX E.4: Gemini
+    # ============================================================================
+    print("\n[4] Appendix E.4 — Gemini 2.5 Flash")
+    print("-" * 60)
+    a, b, c, d = 8, 12, 1, 24
+
+    p1 = fishers_exact_test(a, b, c, d)
+    p2 = fishers_exact_two_sided(a, b, c, d)
+    check("Fisher one-sided (Gemini)", p1, 0.004)
+    check("Fisher two-sided (Gemini)", p2, 0.006)
+
+    h = cohens_h(8/20, 1/25)
+    check("Cohen's h (Gemini)", h, 0.97)
+
+    check_rate("Gemini flag rate", 8, 20, 40.0)
+    ci = binomial_ci_clopper_pearson(8, 20)
+    check("Gemini CI lower", ci[0], 0.191)
+    check("Gemini CI upper", ci[1], 0.639)
+
+    # ============================================================================
+    # 5. APPENDIX E.5: Three-Family Pooled
+    # ============================================================================
+    print("\n[5] Appendix E.5 — Three-Family Pooled")
+    print("-" * 60)
+    a, b, c, d = 28, 72, 1, 24
+
+    p1 = fishers_exact_test(a, b, c, d)
+    p2 = fishers_exact_two_sided(a, b, c, d)
+    check("Fisher one-sided (pooled)", p1, 0.006)
+    check("Fisher two-sided (pooled)", p2, 0.010)
+
+    h = cohens_h(28/100, 1/25)
+    check("Cohen's h (pooled)", h, 0.71)
+
+    check_rate("Pooled LLM flag rate", 28, 100, 28.0)
+    ci = binomial_ci_clopper_pearson(28, 100)
+    check("Pooled LLM CI lower", ci[0], 0.195)
+    check("Pooled LLM CI upper", ci[1], 0.379)
+
+    # ============================================================================
+    # 6. APPENDIX E.6: Per-Model Breakdown
+    # ============================================================================
+    print("\n[6] Appendix E.6 — Per-Model Breakdown")
+    print("-" * 60)
+    # Each model vs human (1/25)
+    models = [
+        ("Gemini 2.5 Flash", 8, 20, 40.0, 0.97, 0.004),
+        ("Sonnet (Exp 8c)", 7, 20, 35.0, 0.86, 0.010),
+        ("Haiku 3.5", 7, 20, 35.0, 0.86, 0.010),
+        ("GPT-4o", 3, 20, 15.0, 0.39, 0.224),
+        ("Sonnet (replication)", 3, 20, 15.0, 0.39, 0.224),
+    ]
+
+    for name, flagged, n, rate_pct, reported_h, reported_p in models:
+        print(f"\n  --- {name} ---")
+        check_rate(f"{name} rate", flagged, n, rate_pct)
+
+        h = cohens_h(flagged/n, 1/25)
+        check(f"{name} Cohen's h", h, reported_h)
+
+        a, b, c, d = flagged, n - flagged, 1, 24
+        p = _fet_cached(a, b, c, d)
+        check(f"{name} Fisher p (1-sided)", p, reported_p)
+
+    # Verify pooled sum
+    total_flagged = sum(map(itemgetter(1), models))
+    total_n = sum(map(itemgetter(2), models))
+    print(f"\n  Pooled sum check: {total_flagged} flagged / {total_n} total")
+    check_rate("Pooled sum", total_flagged, total_n, 28.0)
+
+    # ============================================================================
+    # 7. APPENDIX E.7: Ablation Study
+    # ============================================================================
+    print("\n[7] Appendix E.7 — Ablation Study")
+    print("-" * 60)
+
+    # Load ablation results
+    with open("/sessions/wizardly-optimistic-bohr/ablation_results.json", "rb") as f:
+        ablation = orjson.loads(f.read()) if orjson is not None else json.load(f)
+
+    # Cohen's h per config is reused for the Δh values in [8]
+    ablation_h, ablation_p = ablation_statistics(ablation_configs)
+
+    # The data file's Cohen's h against the paper, once per config; the loop
+    # below then only compares the recomputed h against the paper
+    for cfg in ablation_configs:
+        check(f"{cfg.label} Cohen's h (data file vs paper)", ablation[cfg.key]["cohens_h"], cfg.reported_h)
+
+    for label, key, h_flagged, h_total, l_flagged, l_total, reported_h, reported_p in ablation_configs:
+        print(f"\n  --- {label} ---")
+
+        data = ablation[key]
+        per_model = data["per_model"]
+        data_h_rate, data_l_rate = data["human_rate"], data["llm_rate"]
+        data_p = data["fisher_one_sided_p"]
+
+        # Verify data file matches paper
+        check(f"{label} human_flagged (data)", float(data["human_flagged"]), float(h_flagged), tol=0.5)
+        check(f"{label} llm_flagged (data)", float(data["llm_flagged"]), float(l_flagged), tol=0.5)
+        check(f"{label} human_total (data)", float(data["human_total"]), float(h_total), tol=0.5)
+        check(f"{label} llm_total (data)", float(data["llm_total"]), float(l_total), tol=0.5)
+
+        # Verify rates
+        check_rates([
+            (f"{label} human rate", h_flagged, h_total, data_h_rate * 100),
+            (f"{label} LLM rate", l_flagged, l_total, data_l_rate * 100),
+        ])
+
+        # Recompute Cohen's h
+        h = ablation_h[key]
+        check(f"{label} Cohen's h (recomputed)", h, reported_h)
+
+        # Recompute Fisher's
+        p = ablation_p[key]
+        check(f"{label} Fisher p 1-sided (recomputed)", p, reported_p)
+        check(f"{label} Fisher p 1-sided (vs data file)", p, data_p)
+
+        # Verify per-model sums add up
+        sum_human_flagged = sum_human_n = sum_llm_flagged = sum_llm_n = 0
+        for model, v in per_model.items():
+            flagged, n = v["flagged"], v["n"]
+            if model.startswith("human"):
+                sum_human_flagged += flagged
+                sum_human_n += n
+            else:
+                sum_llm_flagged += flagged
+                sum_llm_n += n
+
+        check(f"{label} per-model human flagged sum", float(sum_human_flagged), float(h_flagged), tol=0.5)
+        check(f"{label} per-model LLM flagged sum", float(sum_llm_flagged), float(l_flagged), tol=0.5)
+        check(f"{label} per-model human n sum", float(sum_human_n), float(h_total), tol=0.5)
+        check(f"{label} per-model LLM n sum", float(sum_llm_n), float(l_total), tol=0.5)
+
+    # ============================================================================
+    # 8. Verify Δh values in ablation table
+    # ============================================================================
+    print("\n[8] Ablation Δh values")
+    print("-" * 60)
+
+    full_h = ablation_h["full"]
+    no_iso_h = ablation_h["no_isolation"]
+    no_chain_h = ablation_h["no_chain"]
+    no_prep_h = ablation_h["no_preparation"]
+
+    delta_no_iso = no_iso_h - full_h
+    delta_no_chain = no_chain_h - full_h
+    delta_no_prep = no_prep_h - full_h
+
+    check("Δh no_isolation", delta_no_iso, 0.131)
+    check("Δh no_chain", delta_no_chain, -0.141)
+    check("Δh no_preparation", delta_no_prep, -0.193)
+
+    # ============================================================================
+    # 9. Verify abstract claims
+    # ============================================================================
+    print("\n[9] Abstract Claims")
+    print("-" * 60)
+    print("  Abstract: 'p = 0.001, Cohen's h = 1.69' — v2 primary result")
+    check("Abstract p (v2 primary)", _fet_cached(9, 11, 1, 24), 0.001, tol=0.001)
+    check("Abstract h (v2 primary)", cohens_h(15/20, 1/25), 1.69)
+
+    print("  Abstract: '28.0% true positive rate...4% false positive rate'")
+    check_rates([
+        ("Abstract TPR", 28, 100, 28.0),
+        ("Abstract FPR", 1, 25, 4.0),
+    ])
+
+    print("  Abstract: 'Fisher's p = 0.006, Cohen's h = 0.71'")
+    check("Abstract pooled p", _fet_cached(28, 72, 1, 24), 0.006)
+    check("Abstract pooled h", cohens_h(28/100, 1/25), 0.71)
+
+    print("  Abstract: 'Gemini...40%, p = 0.004...Cohen's h = 0.97'")
+    check_rate("Abstract Gemini rate", 8, 20, 40.0)
+    check("Abstract Gemini p", _fet_cached(8, 12, 1, 24), 0.004)
+    check("Abstract Gemini h", cohens_h(8/20, 1/25), 0.97)
+
+    # ============================================================================
+    # 10. Cross-check: ablation per-model vs paper table
+    # ============================================================================
+    print("\n[10] Ablation Per-Model Table vs Paper")
+    print("-" * 60)
+    # Paper reports (Section E.7 per-model breakdown):
+    # Model          | Full | No iso | No chain | No prep
+    # Richard (n=5)  | 0/5  | 0/5    | 0/5      | 0/5
+    # Published(n=20)| 1/20 | 1/20   | 1/20     | 2/20
+    # Sonnet orig    | 6/20 | 7/20   | 5/20     | 4/20
+    # Haiku          | 7/20 | 9/20   | 4/20     | 5/20
+    # Sonnet rep     | 3/20 | 4/20   | 3/20     | 5/20
+    # GPT-4o         | 3/20 | 4/20   | 3/20     | 4/20
+    # Gemini         | 8/20 | 9/20   | 6/20     | 8/20
+
+    paper_per_model = {
+        "full": {"human_richard": 0, "human_published": 1, "sonnet_original": 6, "haiku": 7, "sonnet_replication": 3, "gpt4o": 3, "gemini": 8},
+        "no_isolation": {"human_richard": 0, "human_published": 1, "sonnet_original": 7, "haiku": 9, "sonnet_replication": 4, "gpt4o": 4, "gemini": 9},
+        "no_chain": {"human_richard": 0, "human_published": 1, "sonnet_original": 5, "haiku": 4, "sonnet_replication": 3, "gpt4o": 3, "gemini": 6},
+        "no_preparation": {"human_richard": 0, "human_published": 2, "sonnet_original": 4, "haiku": 5, "sonnet_replication": 5, "gpt4o": 4, "gemini": 8},
+    }
+
+    # Outer-join both tables to (config, model, data, paper) cells and diff them
+    # once; a model present on only one side shows up as None on the other
+    cells = []
+    for config_key, paper_vals in paper_per_model.items():
+        data_vals = ablation[config_key]["per_model"]
+        for model in {**paper_vals, **data_vals}:
+            data_flagged = data_vals[model]["flagged"] if model in data_vals else None
+            cells.append((config_key, model, data_flagged, paper_vals.get(model)))
+    for config_key, model, data_flagged, paper_flagged in cells:
         if data_flagged != paper_flagged:
             ERRORS.append(f"  Ablation {config_key}/{model}: data={data_flagged}, paper={paper_flagged}")
             print(f"  [MISMATCH] {config_key}/{model}: data={data_flagged}, paper={paper_flagged}")
-        CHECKS += 1
-
-print(f"  Checked {len(paper_per_model) * 7} per-model cells")
-
-# ============================================================================
-# FINAL SUMMARY
-# ============================================================================
-print("\n\n" + "=" * 72)
-print(f"VERIFICATION COMPLETE: {CHECKS} checks performed")
-print("=" * 72)
-
-if ERRORS:
-    print(f"\n*** {len(ERRORS)} MISMATCHES FOUND ***\n")
-    for e in ERRORS:
-        print(e)
-else:
-    print("\nAll checks passed. No discrepancies found.")
+    CHECKS += len(cells)
+
+    print(f"  Checked {len(cells)} per-model cells")
+
+    # ============================================================================
+    # FINAL SUMMARY
+    # ============================================================================
+    print("\n\n" + "=" * 72)
+    print(f"VERIFICATION COMPLETE: {CHECKS} checks performed")
+    print("=" * 72)
+
+    if ERRORS:
+        print(f"\n*** {len(ERRORS)} MISMATCHES FOUND ***\n")
+        for e in ERRORS:
+            print(e)
+    else:
+        print("\nAll checks passed. No discrepancies found.")
+
+
+if __name__ == "__main__":
+    # The report is collected in memory and written out in a single write;
+    # it is still written if a check raises part-way through
+    report = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(report):
+            main()
+    finally:
+        sys.stdout.write(report.getvalue())
+        sys.stdout.flush()